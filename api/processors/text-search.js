@@ -0,0 +1,41 @@
+import sql from '../db.js';
+
+// Same weights, threshold and result cap as src/backend/text_search.py
+const MIN_SCORE = 0.6;
+const MAX_RESULTS = 100;
+
+export default async function handler(req, res) {
+  const q = (req.query.q || '').trim();
+  const limit = Math.max(1, Math.min(parseInt(req.query.limit, 10) || 20, MAX_RESULTS));
+
+  if (q.length < 2) {
+    return res.status(400).json({ error: "q must be at least 2 characters" });
+  }
+
+  try {
+    // Ranked pg_trgm search of the active dataset version, using idx_processors_search_trgm
+    const result = await sql`
+      SELECT id, product, code_name, integrated_graphics, tdp, score FROM (
+        SELECT id, product, code_name, integrated_graphics, tdp,
+               GREATEST(
+                 word_similarity(${q}, product) * 1.0,
+                 word_similarity(${q}, coalesce(code_name, '')) * 0.9,
+                 word_similarity(${q}, coalesce(integrated_graphics, '')) * 0.8
+               ) AS score
+        FROM processors
+        WHERE (product || ' ' || coalesce(code_name, '') || ' ' || coalesce(integrated_graphics, '')) %> ${q}
+          AND dataset_version IS NOT DISTINCT FROM COALESCE(
+            (SELECT active_version FROM catalog_revision WHERE id = 1), dataset_version
+          )
+      ) AS matches
+      WHERE score >= ${MIN_SCORE}
+      ORDER BY score DESC, product
+      LIMIT ${limit}
+    `;
+
+    res.status(200).json(result.rows);
+  } catch (error) {
+    console.error('Error searching processors:', error);
+    res.status(500).json({ error: error.message });
+  }
+}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Check raw CPU model string resolution
+
+This script builds the name resolver behind /api/processor/resolve/{raw_name}
+from the catalog CSV files and resolves a fixed set of raw model strings, as
+they appear in /proc/cpuinfo or cloud instance listings. Each must resolve to
+the expected catalog product, or to nothing when the exact SKU isn't in the
+catalog: a similar-looking SKU with another model number would report the
+wrong TDP. It exits with status 1 on any mismatch, so it can guard against
+resolver regressions in CI.
+
+Usage:
+    python check_name_resolver.py [--dataset DIR]
+
+Arguments:
+    --dataset DIR: CSV files the resolver is built from (default: src/resources/v1_8)
+
+Example:
+    python check_name_resolver.py
+"""
+
+import os
+import sys
+import glob
+from src.backend.name_resolver import NameResolver, DEFAULT_MIN_SCORE
+from src.backend.normalize import read_processor_rows
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Raw model string -> expected product, or None when the SKU isn't in the catalog
+CASES = {
+    'Intel(R) Xeon(R) Gold 6248 CPU @ 2.50GHz': 'Xeon Gold 6248',
+    'Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz': 'Core i7-8700K',
+    'Intel(R) Core(TM) i5-1135G7 @ 2.40GHz': 'Core i5-1135G7',
+    'Intel(R) Celeron(R) N4020 CPU @ 1.10GHz': 'Celeron N4020',
+    'Intel(R) Xeon(R) E-2288G CPU @ 3.70GHz': 'Xeon E-2288G',
+    'Intel Core Ultra 7 155H': 'Core Ultra 7 155H',
+    'core i7 8700k': 'Core i7-8700K',
+    'xeon platnum 8380': 'Xeon Platinum 8380',
+    # Cloud-only SKUs: close names, different chips
+    'Intel(R) Xeon(R) Platinum 8259CL CPU @ 2.50GHz': None,
+    'Intel(R) Xeon(R) Platinum 8175M CPU @ 2.50GHz': None,
+    'Intel(R) Xeon(R) CPU E5-2686 v4 @ 2.30GHz': None,
+    'Xeon Platinum 8375C': None,
+}
+
+def get_option(name, default, value_type=str):
+    """Return the value following a --name flag on the command line."""
+    if name not in sys.argv:
+        return default
+    try:
+        return value_type(sys.argv[sys.argv.index(name) + 1])
+    except (IndexError, ValueError):
+        print(f"Error: {name} expects a {value_type.__name__} value")
+        sys.exit(1)
+
+def main():
+    dataset = get_option('--dataset', os.path.join(ROOT, 'src', 'resources', 'v1_8'))
+    products = {}
+    for csv_file in sorted(glob.glob(os.path.join(dataset, '*.csv'))):
+        for row in read_processor_rows(csv_file):
+            products.setdefault(row[0])
+    resolver = NameResolver(products)
+
+    failures = 0
+    for raw_name, expected in CASES.items():
+        product, score = resolver.resolve(raw_name)
+        if score < DEFAULT_MIN_SCORE:
+            product = None
+        ok = product == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {raw_name!r} -> {product!r} ({score:.4f}), expected {expected!r}")
+
+    print(f"\n{len(CASES) - failures}/{len(CASES)} resolved as expected")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
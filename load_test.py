@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Load Test the Lithops Processor API
+
+This script generates concurrent load against the API with asyncio. Requests
+follow a weighted mix of endpoints, and processor names are drawn from the CSV
+files in src/resources. It reports latency percentiles, error rates and
+throughput per endpoint and overall.
+
+Usage:
+    python load_test.py [base_url] [--concurrency N] [--rps R] [--duration S]
+                        [--mix SPEC] [--dataset DIR] [--skew S] [--timeout S]
+                        [--output FILE]
+
+Arguments:
+    base_url: The base URL of the API (default: http://localhost:8000)
+    --concurrency N: Number of concurrent workers (default: 10)
+    --rps R: Target requests per second across all workers; 0 sends as fast as
+             the workers allow (default: 0)
+    --duration S: How long to generate load, in seconds (default: 30)
+    --mix SPEC: Weighted endpoint mix as name=weight pairs separated by commas
+                (default: tdp=6,by_id=2,list=1,search=1,batch=1). Endpoints:
+                tdp, tdp_plain, batch, resolve, list, by_id, search, text_search, stats
+    --dataset DIR: Directory of CSV files to draw processor names from
+                   (default: src/resources/v1_8)
+    --skew S: Zipf exponent for name popularity; 0 picks names uniformly,
+              1 makes a few names hot like real traffic (default: 0)
+    --timeout S: Per-request timeout in seconds (default: 10)
+    --output FILE: Also write the results as JSON
+
+Example:
+    python load_test.py
+    python load_test.py http://localhost:8000 --concurrency 50 --rps 500 --duration 60
+    python load_test.py https://www.greencomputinglithops.es --concurrency 5 --rps 10 --mix tdp=1
+"""
+
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import random
+import asyncio
+from urllib.parse import quote
+
+import httpx
+import numpy as np
+
+DEFAULT_MIX = 'tdp=6,by_id=2,list=1,search=1,batch=1'
+
+# Names per request for the batch endpoint
+BATCH_SIZE = 20
+
+# Page size used by the list endpoint
+LIST_PAGE_SIZE = 100
+
+def get_option(name, default, value_type=str):
+    """Return the value following a --name flag on the command line."""
+    if name not in sys.argv:
+        return default
+    try:
+        return value_type(sys.argv[sys.argv.index(name) + 1])
+    except (IndexError, ValueError):
+        print(f"Error: {name} expects a {value_type.__name__} value")
+        sys.exit(1)
+
+def parse_mix(spec):
+    """Parse "tdp=6,list=1" into ([endpoint names], [weights])."""
+    names, weights = [], []
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            print(f"Error: unknown endpoint '{name}' in --mix, expected one of {', '.join(ENDPOINTS)}")
+            sys.exit(1)
+        try:
+            weight = float(weight) if weight else 1.0
+        except ValueError:
+            print(f"Error: invalid weight in --mix: {part}")
+            sys.exit(1)
+        if weight > 0:
+            names.append(name)
+            weights.append(weight)
+    if not names:
+        print("Error: --mix selects no endpoints")
+        sys.exit(1)
+    return names, weights
+
+def load_processor_names(dataset):
+    """Return the distinct product names in the dataset's CSV files."""
+    names = {}
+    for csv_file in sorted(glob.glob(os.path.join(dataset, '*.csv'))):
+        with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('Product'):
+                    names.setdefault(row['Product'], None)
+    return list(names)
+
+class Workload:
+    """Draws endpoints and parameters for each request."""
+
+    def __init__(self, mix, names, skew, processor_ids, seed=None):
+        self.endpoints, self.endpoint_weights = mix
+        self.names = names
+        self.processor_ids = processor_ids
+        self.rng = random.Random(seed)
+        # Cumulative Zipf weights; rank 1 is the most popular name
+        weights = [1.0 / (rank ** skew) for rank in range(1, len(names) + 1)]
+        self.name_weights = list(np.cumsum(weights))
+        self.rng.shuffle(self.names)
+
+    def name(self):
+        return self.rng.choices(self.names, cum_weights=self.name_weights)[0]
+
+    def next_request(self):
+        """Return (endpoint, method, path, json body)."""
+        endpoint = self.rng.choices(self.endpoints, weights=self.endpoint_weights)[0]
+        return (endpoint,) + ENDPOINTS[endpoint](self)
+
+def _tdp(workload):
+    return 'GET', f'/api/processor/tdp/{quote(workload.name(), safe="")}', None
+
+def _tdp_plain(workload):
+    return 'GET', f'/processor/tdp/{quote(workload.name(), safe="")}', None
+
+def _batch(workload):
+    return 'POST', '/api/processor/tdp/batch', {'names': [workload.name() for _ in range(BATCH_SIZE)]}
+
+def _resolve(workload):
+    return 'GET', f'/api/processor/resolve/{quote("Intel(R) " + workload.name() + " CPU", safe="")}', None
+
+def _list(workload):
+    pages = max(1, len(workload.processor_ids) // LIST_PAGE_SIZE)
+    return 'GET', f'/processors/?skip={workload.rng.randrange(pages) * LIST_PAGE_SIZE}&limit={LIST_PAGE_SIZE}', None
+
+def _by_id(workload):
+    return 'GET', f'/processors/{workload.rng.choice(workload.processor_ids)}', None
+
+def _search(workload):
+    cores = workload.rng.choice((2, 4, 8, 16, 32))
+    return 'GET', f'/api/processors/search?min_cores={cores}&sort=max_turbo_freq&order=desc&limit=20', None
+
+def _text_search(workload):
+    # The model part of a name, lowercased, as a user would type it
+    query = ' '.join(workload.name().split()[-2:]).lower()
+    return 'GET', f'/api/processors/text-search?q={quote(query, safe="")}&limit=20', None
+
+def _stats(workload):
+    return 'GET', '/api/stats?dimension=family', None
+
+ENDPOINTS = {
+    'tdp': _tdp,
+    'tdp_plain': _tdp_plain,
+    'batch': _batch,
+    'resolve': _resolve,
+    'list': _list,
+    'by_id': _by_id,
+    'search': _search,
+    'text_search': _text_search,
+    'stats': _stats,
+}
+
+class RateLimiter:
+    """Hands out send times spaced 1/rps apart, shared by all workers (open loop)."""
+
+    def __init__(self, rps, started):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self.started = started
+        self.sent = 0
+
+    async def wait(self):
+        """Sleep until the next send slot and return its scheduled time."""
+        if self.interval == 0.0:
+            return time.perf_counter()
+        scheduled = self.started + self.sent * self.interval
+        self.sent += 1
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return scheduled
+
+async def worker(client, workload, limiter, deadline, results):
+    while True:
+        scheduled = await limiter.wait()
+        if scheduled >= deadline:
+            return
+        endpoint, method, path, body = workload.next_request()
+        try:
+            response = await client.request(method, path, json=body)
+            outcome = response.status_code
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        # Measured from the scheduled send time, so a slow server can't hide
+        # queueing delay by holding back the next request (coordinated omission)
+        results.append((endpoint, time.perf_counter() - scheduled, outcome))
+
+def summarize(samples, elapsed):
+    """Latency percentiles in milliseconds, error rate and throughput."""
+    latencies = np.array([latency for _, latency, _ in samples], dtype=np.float64) * 1000.0
+    outcomes = {}
+    for _, _, outcome in samples:
+        outcomes[str(outcome)] = outcomes.get(str(outcome), 0) + 1
+    errors = sum(count for outcome, count in outcomes.items() if not outcome.startswith('2'))
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4),
+        'throughput_rps': round(len(samples) / elapsed, 1) if elapsed > 0 else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p90_ms': round(float(np.percentile(latencies, 90)), 3),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'max_ms': round(float(latencies.max()), 3),
+        'status_codes': outcomes,
+    }
+
+async def discover_processor_ids(client):
+    """Fetch processor ids for the by-id and list endpoints."""
+    try:
+        response = await client.get('/processors/?limit=100000')
+        if response.status_code == 200:
+            return [processor['id'] for processor in response.json()]
+    except (httpx.HTTPError, ValueError, KeyError, TypeError):
+        pass
+    return []
+
+async def run(base_url, concurrency, rps, duration, mix, names, skew, timeout):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        processor_ids = await discover_processor_ids(client)
+        if not processor_ids:
+            # by_id and list need real ids
+            kept = [(name, weight) for name, weight in zip(*mix) if name not in ('by_id', 'list')]
+            if len(kept) < len(mix[0]):
+                print("Could not list processors, dropping by_id and list from the mix")
+            if not kept:
+                print("Error: nothing left in the endpoint mix")
+                sys.exit(1)
+            mix = ([name for name, _ in kept], [weight for _, weight in kept])
+
+        workload = Workload(mix, names, skew, processor_ids)
+        results = []
+        started = time.perf_counter()
+        limiter = RateLimiter(rps, started)
+        deadline = started + duration
+        await asyncio.gather(*(
+            worker(client, workload, limiter, deadline, results) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+def print_report(report):
+    print(f"\n{'endpoint':<10} {'requests':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for endpoint, stats in list(report['endpoints'].items()) + [('total', report['total'])]:
+        print(f"{endpoint:<10} {stats['requests']:>8} {stats['error_rate']:>7.2%} {stats['throughput_rps']:>8.1f} "
+              f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+    print(f"\nStatus codes: {report['total']['status_codes']}")
+
+def main():
+    positional = [arg for i, arg in enumerate(sys.argv[1:], 1)
+                  if not arg.startswith('--') and not sys.argv[i - 1].startswith('--')]
+    base_url = positional[0] if positional else 'http://localhost:8000'
+    concurrency = get_option('--concurrency', 10, int)
+    rps = get_option('--rps', 0.0, float)
+    duration = get_option('--duration', 30.0, float)
+    mix = parse_mix(get_option('--mix', DEFAULT_MIX))
+    dataset = get_option('--dataset', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'resources', 'v1_8'))
+    skew = get_option('--skew', 0.0, float)
+    timeout = get_option('--timeout', 10.0, float)
+    output = get_option('--output', None)
+
+    names = load_processor_names(dataset)
+    if not names:
+        print(f"Error: no processor names found in {dataset}")
+        sys.exit(1)
+
+    target = f"{rps:.0f} req/s" if rps > 0 else "unthrottled"
+    print(f"Load testing {base_url}: {concurrency} workers, {target}, {duration:.0f}s, "
+          f"{len(names)} processor names")
+
+    results, elapsed = asyncio.run(run(base_url, concurrency, rps, duration, mix, names, skew, timeout))
+    if not results:
+        print("No requests completed")
+        sys.exit(1)
+
+    by_endpoint = {}
+    for sample in results:
+        by_endpoint.setdefault(sample[0], []).append(sample)
+    report = {
+        'base_url': base_url,
+        'concurrency': concurrency,
+        'target_rps': rps,
+        'duration_s': round(elapsed, 3),
+        'endpoints': {endpoint: summarize(samples, elapsed) for endpoint, samples in sorted(by_endpoint.items())},
+        'total': summarize(results, elapsed),
+    }
+    print_report(report)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from sqlalchemy import update
+from . import models
+
+# How long a known catalog revision is trusted before re-reading it, so imports
+# done by the standalone scripts are picked up without a query per request
+CATALOG_REVISION_TTL = float(os.getenv("CATALOG_REVISION_TTL", "5"))
+
+# max-age sent to clients and edge caches; they revalidate with the ETag afterwards
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+
+# Responses that reflect live server state rather than the catalog
+UNCACHED_PATH_PREFIXES = ("/api/pool/", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+# Collection routes that answer 200 for any catalog revision, so a matching
+# validator can be answered with a 304 before routing. Item routes
+# (/processors/{id}, /api/processor/tdp/{name}, ...) may 404 and are only
+# revalidated once the route has found the resource
+REVALIDATE_BEFORE_ROUTING = frozenset((
+    "/processors/", "/api/processors/page", "/api/processors/search", "/api/processors/text-search",
+    "/api/processors/stream", "/api/stats", "/api/catalog/select", "/api/catalog/aggregate", "/api/datasets",
+))
+
+_ROW_ID = 1
+
+
+def _as_utc(value):
+    if value is None:
+        return datetime.fromtimestamp(0, timezone.utc)
+    # SQLite hands back naive datetimes; they are written in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class CatalogRevisionTracker:
+    """Caches the catalog revision and derives HTTP validators from it."""
+
+    def __init__(self):
+        self.revision = None
+        self.updated_at = None
+        self.active_version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def on_change(self, callback):
+        """Register callback(db) to run when a new revision is observed."""
+        self._listeners.append(callback)
+
+    def _load(self, db):
+        row = db.get(models.CatalogRevision, _ROW_ID)
+        db.expire_all()
+        if row is None:
+            return 0, None, None
+        return row.revision, _as_utc(row.updated_at), row.active_version
+
+    def refresh(self, db, force=False):
+        """Re-read the revision if the TTL expired (or force); return True if it changed."""
+        if not force and time.monotonic() - self._checked_at < CATALOG_REVISION_TTL:
+            return False
+
+        with self._lock:
+            revision, updated_at, active_version = self._load(db)
+            self._checked_at = time.monotonic()
+            changed = self.revision is not None and revision != self.revision
+            self.revision, self.updated_at = revision, updated_at
+            self.active_version = active_version
+
+        if changed:
+            for callback in self._listeners:
+                callback(db)
+        return changed
+
+    def bump(self, db):
+        """Increment the revision after an import, committing the change."""
+        now = datetime.now(timezone.utc)
+        result = db.execute(
+            update(models.CatalogRevision)
+            .where(models.CatalogRevision.id == _ROW_ID)
+            .values(revision=models.CatalogRevision.revision + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            db.add(models.CatalogRevision(id=_ROW_ID, revision=1, updated_at=now))
+        db.commit()
+        self.refresh(db, force=True)
+
+    @property
+    def stale(self):
+        return self.revision is None or time.monotonic() - self._checked_at >= CATALOG_REVISION_TTL
+
+    @property
+    def etag(self):
+        updated = int(_as_utc(self.updated_at).timestamp())
+        return f'"catalog-{self.revision}-{updated}"'
+
+    @property
+    def last_modified(self):
+        return format_datetime(_as_utc(self.updated_at).replace(microsecond=0), usegmt=True)
+
+    def not_modified(self, headers):
+        """Evaluate If-None-Match / If-Modified-Since against the current revision."""
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since is not None and self.updated_at is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return _as_utc(self.updated_at).replace(microsecond=0) <= _as_utc(since)
+        return False
+
+    def cache_headers(self):
+        return {
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+            "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate",
+        }
+
+
+catalog_revision = CatalogRevisionTracker()
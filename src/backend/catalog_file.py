@@ -0,0 +1,307 @@
+"""Self-contained, read-only SQLite copy of one dataset version.
+
+build_catalog_file.py writes it with every index prebuilt; CatalogFile answers
+the same lookups and searches as the API from it, without a network or a
+database server. It only needs the standard library and NumPy, not FastAPI,
+SQLAlchemy or a DATABASE_URL.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+import numpy as np
+from .name_resolver import NameResolver, DEFAULT_MIN_SCORE
+from .normalize import PROCESSOR_COLUMNS, parse_memory_types, parse_release_bound
+from .pagination import MAX_PAGE_SIZE
+from .text_search_common import FIELD_WEIGHTS, MIN_SCORE, search_trigrams
+
+# Bumped when the file layout changes; readers refuse files of another format
+FORMAT_VERSION = 1
+
+# Same cap as /api/processors/text-search
+MAX_TEXT_SEARCH_RESULTS = 100
+
+# Names per query in lookup_many(); older SQLite builds allow 999 bound parameters
+LOOKUP_CHUNK_SIZE = 500
+
+COLUMN_TYPES = {
+    "cores": "INTEGER", "threads": "INTEGER", "tdp": "INTEGER", "max_memory_size": "INTEGER",
+    "max_memory_speed": "INTEGER", "release_quarter": "INTEGER", "lithography": "REAL",
+    "max_turbo_freq": "REAL", "base_freq": "REAL", "cache": "REAL",
+}
+STORED_COLUMNS = ("id",) + PROCESSOR_COLUMNS + ("dataset_version",)
+
+# Columns /api/processors/search can sort on
+SORT_COLUMNS = (
+    "id", "product", "cores", "threads", "lithography", "base_freq",
+    "max_turbo_freq", "tdp", "cache", "release_quarter",
+)
+
+# search() range filters: keyword prefix -> column
+RANGE_FILTERS = {
+    "cores": "cores", "threads": "threads", "lithography": "lithography", "base_freq": "base_freq",
+    "turbo_freq": "max_turbo_freq", "tdp": "tdp", "cache": "cache",
+}
+
+SCHEMA_SQL = f"""
+CREATE TABLE catalog_meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE processors (
+    id INTEGER PRIMARY KEY,
+    {", ".join(f"{name} {COLUMN_TYPES.get(name, 'TEXT')}" for name in STORED_COLUMNS[1:])}
+);
+-- First row per product, like the API's TDP index
+CREATE TABLE tdp_lookup (product TEXT PRIMARY KEY, tdp INTEGER) WITHOUT ROWID;
+CREATE TABLE processor_memory_support (
+    processor_id INTEGER NOT NULL,
+    memory_kind TEXT NOT NULL,
+    speed_mts INTEGER,
+    PRIMARY KEY (processor_id, memory_kind)
+) WITHOUT ROWID;
+-- Inverted trigram index for text_search(): the ids containing each trigram, as int32 arrays
+CREATE TABLE processor_trigrams (
+    trigram TEXT NOT NULL,
+    field TEXT NOT NULL,
+    processor_ids BLOB NOT NULL,
+    PRIMARY KEY (trigram, field)
+) WITHOUT ROWID;
+"""
+
+# Same indexes as models.Processor and models.ProcessorMemorySupport
+INDEX_SQL = """
+CREATE INDEX idx_processors_product ON processors (product);
+CREATE INDEX idx_processors_status_cores ON processors (status, cores);
+CREATE INDEX idx_processors_status_lithography ON processors (status, lithography);
+CREATE INDEX idx_processors_code_name ON processors (code_name);
+CREATE INDEX idx_processors_turbo_desc ON processors (max_turbo_freq DESC) WHERE max_turbo_freq IS NOT NULL;
+CREATE INDEX idx_processors_tdp ON processors (tdp);
+CREATE INDEX idx_processors_release_quarter ON processors (release_quarter);
+CREATE INDEX idx_memory_support_kind_speed ON processor_memory_support (memory_kind, speed_mts, processor_id);
+"""
+
+
+def write_catalog_file(path, rows, dataset_version=None, source=None):
+    """Write rows (tuples ordered like STORED_COLUMNS) to a new catalog file at path.
+
+    The file is built next to path and moved into place, so readers never see a
+    partial file. Returns the number of processors written.
+    """
+    temp_path = f"{path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.executescript(SCHEMA_SQL)
+        placeholders = ", ".join("?" * len(STORED_COLUMNS))
+        conn.executemany(f"INSERT INTO processors VALUES ({placeholders})", rows)
+
+        at = {name: position for position, name in enumerate(STORED_COLUMNS)}
+        tdps = {}
+        for row in rows:
+            tdps.setdefault(row[at["product"]], row[at["tdp"]])
+        conn.executemany("INSERT INTO tdp_lookup VALUES (?, ?)", tdps.items())
+        conn.executemany(
+            "INSERT INTO processor_memory_support VALUES (?, ?, ?)",
+            (
+                (row[0], kind, speed)
+                for row in rows for kind, speed in parse_memory_types(row[at["memory_types"]]).items()
+            )
+        )
+        postings = {}
+        for row in rows:
+            for field in FIELD_WEIGHTS:
+                for trigram in search_trigrams(row[at[field]]):
+                    postings.setdefault((trigram, field), []).append(row[0])
+        conn.executemany("INSERT INTO processor_trigrams VALUES (?, ?, ?)", (
+            (trigram, field, np.array(ids, dtype="<i4").tobytes()) for (trigram, field), ids in postings.items()
+        ))
+        conn.executescript(INDEX_SQL)
+
+        metadata = {
+            "format_version": FORMAT_VERSION,
+            "dataset_version": dataset_version,
+            "source": source,
+            "processors": len(rows),
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        conn.executemany("INSERT INTO catalog_meta VALUES (?, ?)", (
+            (key, None if value is None else str(value)) for key, value in metadata.items()
+        ))
+        conn.commit()
+        # Planner statistics for the prebuilt indexes, then compact the file
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(temp_path, path)
+    return len(rows)
+
+
+class CatalogFile:
+    """Read-only lookups and searches over a file written by write_catalog_file().
+
+    Methods mirror the API: lookup()/lookup_many()/resolve() the /api/processor/tdp
+    and resolve endpoints, get() /processors/{id}, search() /api/processors/search
+    and text_search() /api/processors/text-search. Invalid arguments raise
+    ValueError where the API answers 400. Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        # immutable=1: the file never changes, so SQLite skips locking entirely
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.metadata = dict(self._conn.execute("SELECT key, value FROM catalog_meta"))
+        if self.metadata.get("format_version") != str(FORMAT_VERSION):
+            self._conn.close()
+            raise ValueError(f"Unsupported catalog file format: {self.metadata.get('format_version')}")
+        self.dataset_version = self.metadata.get("dataset_version")
+        self._resolver = None
+        self._product_rank = None
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return int(self.metadata["processors"])
+
+    def lookup(self, name):
+        """Return (found, tdp) for an exact product name."""
+        row = self._conn.execute("SELECT tdp FROM tdp_lookup WHERE product = ?", (name,)).fetchone()
+        return (True, row[0]) if row is not None else (False, None)
+
+    def lookup_many(self, names):
+        """Resolve a list of names, returning (found, missing)."""
+        names = list(dict.fromkeys(names))
+        tdps = {}
+        # Chunked to stay under SQLite's limit on bound parameters
+        for start in range(0, len(names), LOOKUP_CHUNK_SIZE):
+            chunk = names[start:start + LOOKUP_CHUNK_SIZE]
+            tdps.update(self._conn.execute(
+                f"SELECT product, tdp FROM tdp_lookup WHERE product IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        found = {name: tdps[name] for name in names if name in tdps}
+        return found, [name for name in names if name not in tdps]
+
+    def resolve(self, raw_name, min_score=DEFAULT_MIN_SCORE):
+        """Resolve a raw CPU model string to (product, tdp, score).
+
+        Returns (None, None, 0.0) when no catalog name scores at least min_score.
+        """
+        with self._lock:
+            if self._resolver is None:
+                # Built on first use; most workers only do exact lookups
+                self._resolver = NameResolver(product for (product,) in self._conn.execute(
+                    "SELECT product FROM processors GROUP BY product ORDER BY min(id)"
+                ))
+        product, score = self._resolver.resolve(raw_name)
+        if product is None or score < min_score:
+            return None, None, 0.0
+        return product, self.lookup(product)[1], score
+
+    def get(self, processor_id):
+        """The processor with this id as a dict, or None."""
+        row = self._conn.execute("SELECT * FROM processors WHERE id = ?", (processor_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def search(self, status=None, code_name=None, released_from=None, released_to=None, memory_kind=None,
+               min_memory_speed=None, sort="id", order="asc", limit=100, **ranges):
+        """Processors matching every filter, as dicts.
+
+        ranges are inclusive min_/max_ bounds named like the API's query
+        parameters: cores, threads, lithography, base_freq, turbo_freq, tdp and
+        cache, e.g. search(min_cores=16, max_tdp=150, sort="tdp").
+        """
+        clauses, params = [], []
+        for key, value in ranges.items():
+            bound, _, name = key.partition("_")
+            if bound not in ("min", "max") or name not in RANGE_FILTERS:
+                raise TypeError(f"search() got an unexpected keyword argument '{key}'")
+            if value is not None:
+                clauses.append(f"{RANGE_FILTERS[name]} {'>=' if bound == 'min' else '<='} ?")
+                params.append(value)
+        for clause, value, upper in (("release_quarter >= ?", released_from, False),
+                                     ("release_quarter <= ?", released_to, True)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(parse_release_bound(value, upper))
+        for column, value in (("status", status), ("code_name", code_name)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if memory_kind is not None:
+            matching = "SELECT processor_id FROM processor_memory_support WHERE memory_kind = ?"
+            params.append(memory_kind.upper())
+            if min_memory_speed is not None:
+                matching += " AND speed_mts >= ?"
+                params.append(min_memory_speed)
+            clauses.append(f"id IN ({matching})")
+        elif min_memory_speed is not None:
+            raise ValueError("min_memory_speed requires memory_kind")
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Invalid sort column: {sort}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Invalid order: {order}")
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(max(1, min(limit, MAX_PAGE_SIZE)))
+        rows = self._conn.execute(
+            f"SELECT * FROM processors{where} ORDER BY {sort} IS NULL, {sort} {order}, id LIMIT ?", params
+        )
+        return [dict(row) for row in rows]
+
+    def text_search(self, q, limit=20):
+        """Ranked trigram search over product, code name and graphics, best match first.
+
+        Scores match the API's in-memory index: per field, the share of the
+        query's trigrams it contains times the field weight; the best field counts.
+        """
+        if len(q.strip()) < 2:
+            raise ValueError("q must be at least 2 characters")
+        query_trigrams = search_trigrams(q)
+        if not query_trigrams:
+            return []
+        limit = max(1, min(limit, MAX_TEXT_SEARCH_RESULTS))
+
+        with self._lock:
+            if self._product_rank is None:
+                # Position of each id in product name order, for tie-breaking
+                ids = np.array(
+                    [row[0] for row in self._conn.execute("SELECT id FROM processors ORDER BY product, id")],
+                    dtype=np.int64
+                )
+                self._product_rank = np.zeros(ids.max() + 1 if len(ids) else 0, dtype=np.int64)
+                self._product_rank[ids] = np.arange(len(ids))
+        product_rank = self._product_rank
+
+        postings = {field: [] for field in FIELD_WEIGHTS}
+        placeholders = ", ".join("?" * len(query_trigrams))
+        for field, processor_ids in self._conn.execute(
+            f"SELECT field, processor_ids FROM processor_trigrams WHERE trigram IN ({placeholders})",
+            list(query_trigrams)
+        ):
+            postings[field].append(np.frombuffer(processor_ids, dtype="<i4"))
+        scores = np.zeros(len(product_rank), dtype=np.float64)
+        for field, weight in FIELD_WEIGHTS.items():
+            if postings[field]:
+                counts = np.bincount(np.concatenate(postings[field]), minlength=len(scores)).astype(np.float64)
+                np.maximum(scores, counts * (weight / len(query_trigrams)), out=scores)
+
+        matches = np.flatnonzero(scores >= MIN_SCORE)
+        # Ties go to the product name, like ORDER BY score DESC, product
+        ranked = matches[np.lexsort((product_rank[matches], -scores[matches]))][:limit].tolist()
+        if not ranked:
+            return []
+        rows = {row["id"]: row for row in self._conn.execute(
+            "SELECT id, product, code_name, integrated_graphics, tdp FROM processors "
+            f"WHERE id IN ({', '.join('?' * len(ranked))})", ranked
+        )}
+        return [dict(rows[processor_id], score=round(float(scores[processor_id]), 4)) for processor_id in ranked]
@@ -0,0 +1,174 @@
+import numpy as np
+from . import models
+from .normalize import FLOAT_COLUMNS, INTEGER_COLUMNS, PROCESSOR_COLUMNS
+from .datasets import resolve_version, scope_to_version
+
+NUMERIC_COLUMNS = INTEGER_COLUMNS + FLOAT_COLUMNS
+STRING_COLUMNS = tuple(c for c in PROCESSOR_COLUMNS if c not in NUMERIC_COLUMNS)
+
+AGGREGATES = {
+    "count": lambda values: int(values.size),
+    "sum": lambda values: float(values.sum()) if values.size else None,
+    "mean": lambda values: float(values.mean()) if values.size else None,
+    "min": lambda values: float(values.min()) if values.size else None,
+    "max": lambda values: float(values.max()) if values.size else None,
+}
+
+
+class ColumnarCatalog:
+    """Read-only, column-oriented copy of the processor catalog.
+
+    Numeric columns are NumPy arrays (integers with a validity mask, floats with
+    NaN for missing values) and string columns are dictionary encoded, so
+    filters, sorts and aggregates run as vectorized operations.
+    """
+
+    def __init__(self, ids, records):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.size = len(self.ids)
+        self.values = {}
+        self.valid = {}
+        self.codes = {}
+        self.categories = {}
+        self._category_codes = {}
+
+        columns = list(zip(*records)) if records else [()] * len(PROCESSOR_COLUMNS)
+        for name, column in zip(PROCESSOR_COLUMNS, columns):
+            if name in INTEGER_COLUMNS:
+                valid = np.array([value is not None for value in column], dtype=bool)
+                self.values[name] = np.array(
+                    [value if value is not None else 0 for value in column], dtype=np.int32
+                )
+                self.valid[name] = valid
+            elif name in FLOAT_COLUMNS:
+                values = np.array(
+                    [value if value is not None else np.nan for value in column], dtype=np.float64
+                )
+                self.values[name] = values
+                self.valid[name] = ~np.isnan(values)
+            else:
+                categories, codes = np.unique(
+                    np.array([value or "" for value in column], dtype=object), return_inverse=True
+                )
+                self.categories[name] = categories.tolist()
+                self.codes[name] = codes.astype(np.int32)
+                self._category_codes[name] = {value: i for i, value in enumerate(self.categories[name])}
+
+    @classmethod
+    def from_db(cls, db, version=None):
+        columns = [getattr(models.Processor, name) for name in PROCESSOR_COLUMNS]
+        query = scope_to_version(db.query(models.Processor.id, *columns), version)
+        rows = query.order_by(models.Processor.id).all()
+        return cls([row[0] for row in rows], [tuple(row[1:]) for row in rows])
+
+    def mask(self, ranges=None, equals=None):
+        """Boolean row mask for inclusive numeric ranges and string equality.
+
+        ranges maps a numeric column to (low, high), either bound may be None;
+        equals maps a string column to the required value.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for name, (low, high) in (ranges or {}).items():
+            if name not in self.values:
+                raise KeyError(f"Unknown numeric column: {name}")
+            values = self.values[name]
+            mask &= self.valid[name]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        for name, value in (equals or {}).items():
+            if name not in self.codes:
+                raise KeyError(f"Unknown string column: {name}")
+            code = self._category_codes[name].get(value)
+            if code is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= self.codes[name] == code
+        return mask
+
+    def select(self, mask, sort=None, descending=False, limit=None):
+        """Return the row positions matching mask, optionally sorted and truncated."""
+        positions = np.flatnonzero(mask)
+        if sort is not None:
+            if sort in self.values:
+                keys = self.values[sort][positions].astype(np.float64)
+                keys[~self.valid[sort][positions]] = np.nan
+                # Missing values sort last in either direction
+                order = np.argsort(-keys if descending else keys, kind="stable")
+            elif sort in self.codes:
+                order = np.argsort(self.codes[sort][positions], kind="stable")
+                if descending:
+                    order = order[::-1]
+            else:
+                raise KeyError(f"Unknown column: {sort}")
+            positions = positions[order]
+        if limit is not None:
+            positions = positions[:limit]
+        return positions
+
+    def row(self, position):
+        record = {"id": int(self.ids[position])}
+        for name in PROCESSOR_COLUMNS:
+            if name in self.codes:
+                record[name] = self.categories[name][self.codes[name][position]]
+            elif self.valid[name][position]:
+                value = self.values[name][position]
+                record[name] = int(value) if name in INTEGER_COLUMNS else float(value)
+            else:
+                record[name] = None
+        return record
+
+    def rows(self, positions):
+        return [self.row(position) for position in positions]
+
+    def aggregate(self, column, func, mask=None, group_by=None):
+        """Aggregate a numeric column over the masked rows, optionally per string group."""
+        if func not in AGGREGATES:
+            raise KeyError(f"Unknown aggregate: {func}")
+        if column not in self.values:
+            raise KeyError(f"Unknown numeric column: {column}")
+
+        mask = np.ones(self.size, dtype=bool) if mask is None else mask
+        if func != "count":
+            mask = mask & self.valid[column]
+        values = self.values[column]
+
+        if group_by is None:
+            return AGGREGATES[func](values[mask])
+
+        if group_by not in self.codes:
+            raise KeyError(f"Unknown string column: {group_by}")
+        codes = self.codes[group_by][mask]
+        selected = values[mask]
+        order = np.argsort(codes, kind="stable")
+        codes, selected = codes[order], selected[order]
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+        groups = {}
+        for chunk_codes, chunk in zip(np.split(codes, boundaries), np.split(selected, boundaries)):
+            if chunk_codes.size:
+                groups[self.categories[group_by][chunk_codes[0]]] = AGGREGATES[func](chunk)
+        return groups
+
+
+class ColumnarCatalogStore:
+    """Holds the current ColumnarCatalog and swaps in a new one on rebuild."""
+
+    def __init__(self):
+        self.catalog = None
+
+    @property
+    def ready(self):
+        return self.catalog is not None
+
+    def rebuild(self, db):
+        self.catalog = ColumnarCatalog.from_db(db, resolve_version())
+        return self.catalog.size
+
+    def snapshot(self):
+        return self.catalog
+
+    def restore(self, state):
+        self.catalog = state
+
+
+columnar_catalog = ColumnarCatalogStore()
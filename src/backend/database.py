@@ -1,16 +1,120 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Connection pool tuning, all overridable from the environment
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Serve read routes through an async engine (needs asyncpg, or aiosqlite for SQLite)
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+
+class PoolStats:
+    """Running statistics of how long requests waited to check out a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._observers = []
+
+    def add_observer(self, callback):
+        """Also pass every checkout wait (in seconds) to callback."""
+        self._observers.append(callback)
+
+    def record(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            if seconds > self.max_wait:
+                self.max_wait = seconds
+        for callback in self._observers:
+            callback(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "total_wait_seconds": round(self.total_wait, 6),
+                "avg_wait_seconds": round(self.total_wait / self.checkouts, 6) if self.checkouts else 0.0,
+                "max_wait_seconds": round(self.max_wait, 6),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record(time.perf_counter() - started)
+
+
+def _pool_options(url, poolclass):
+    # In-memory SQLite needs its default single-connection pool; file databases
+    # only get the timed pool since the sizing knobs target server databases
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return {}
+        return {"poolclass": poolclass}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _connect_args(url):
+    if DB_STATEMENT_TIMEOUT_MS <= 0 or url.get_backend_name() != "postgresql":
+        return {}
+    if url.get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+
+
+_url = make_url(DATABASE_URL)
+engine = create_engine(
+    _url,
+    connect_args=_connect_args(_url),
+    **_pool_options(_url, TimedQueuePool),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+_engine_hooks = []
+
+def on_engine_created(hook):
+    """Run hook(sync_engine) on the engine and on the async engine once it exists."""
+    _engine_hooks.append(hook)
+    hook(engine)
+    if _async_session_factory is not None:
+        hook(_async_session_factory.kw["bind"].sync_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -18,4 +122,70 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _async_url():
+    if ASYNC_DATABASE_URL:
+        return make_url(ASYNC_DATABASE_URL)
+    if _url.get_backend_name() == "sqlite":
+        return _url.set(drivername="sqlite+aiosqlite")
+    return _url.set(drivername="postgresql+asyncpg")
+
+
+_async_session_factory = None
+
+def get_async_sessionmaker():
+    """Create the async engine on first use; sqlalchemy.ext.asyncio needs greenlet."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                finally:
+                    pool_stats.record(time.perf_counter() - started)
+
+        url = _async_url()
+        async_engine = create_async_engine(
+            url,
+            connect_args=_connect_args(url),
+            **_pool_options(url, TimedAsyncQueuePool),
+        )
+        for hook in _engine_hooks:
+            hook(async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session_factory
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+# Dependency for read-only routes: an AsyncSession when DB_ASYNC is on, else a sync Session
+get_read_db = get_async_db if DB_ASYNC else get_db
+
+
+async def fetch_all(db, statement):
+    """Run a select on either session kind without blocking the event loop."""
+    if DB_ASYNC:
+        return (await db.scalars(statement)).all()
+    return await run_in_threadpool(lambda: db.scalars(statement).all())
+
+
+async def fetch_rows(db, statement):
+    """Like fetch_all, but returns whole rows for multi-column selects."""
+    if DB_ASYNC:
+        return (await db.execute(statement)).all()
+    return await run_in_threadpool(lambda: db.execute(statement).all())
+
+
+async def fetch_one(db, statement):
+    if DB_ASYNC:
+        return (await db.scalars(statement)).first()
+    return await run_in_threadpool(lambda: db.scalars(statement).first())
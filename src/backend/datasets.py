@@ -0,0 +1,173 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from sqlalchemy import update
+from . import models
+from .caching import catalog_revision
+from .normalize import DIFF_COLUMNS, row_digest, version_sort_key
+
+_ROW_ID = 1
+
+# Diffs are keyed by the two content hashes, so cached results never go stale
+MAX_CACHED_DIFFS = 32
+
+
+def resolve_version(requested=None):
+    """The requested dataset version, defaulting to the active one (None means all rows)."""
+    return requested or catalog_revision.active_version
+
+
+def scope_to_version(query, version):
+    """Restrict a processors Query or Select to one dataset version."""
+    if version is None:
+        return query
+    return query.filter(models.Processor.dataset_version == version)
+
+
+def active_version(db):
+    """Read the active version from the database, bypassing the cached revision."""
+    row = db.get(models.CatalogRevision, _ROW_ID)
+    return row.active_version if row is not None else None
+
+
+def version_digests(db, version):
+    """Map each product of a version to (row digest, values, columns); the first row per product wins.
+
+    columns holds the DIFF_COLUMNS positions that have a value in any row from
+    the same source file: older exports lack some columns (v1_6 files have no
+    code name or memory fields), and those are left out of diffs.
+    """
+    columns = [getattr(models.Processor, name) for name in DIFF_COLUMNS]
+    rows = (
+        db.query(models.Processor.product, models.Processor.source_file, *columns)
+        .filter(models.Processor.dataset_version == version)
+        .order_by(models.Processor.id)
+    )
+    digests, sources, populated = {}, {}, {}
+    for product, source_file, *values in rows:
+        present = populated.setdefault(source_file, set())
+        present.update(i for i, value in enumerate(values) if value is not None and value != "")
+        if product not in digests:
+            digests[product] = (row_digest(values), values)
+            sources[product] = source_file
+    return {
+        product: (digest, values, populated[sources[product]])
+        for product, (digest, values) in digests.items()
+    }
+
+
+def content_hash(digests):
+    """Order-independent hash of a version's rows."""
+    digest = hashlib.sha256()
+    for product in sorted(digests):
+        digest.update(f"{product}\x1e{digests[product][0]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def register_version(db, version):
+    """Record a version's row count and content hash; the caller commits.
+
+    The first version registered becomes the active one. Returns True if it was
+    activated.
+    """
+    digests = version_digests(db, version)
+    record = db.get(models.DatasetVersion, version)
+    if record is None:
+        record = models.DatasetVersion(version=version)
+        db.add(record)
+    record.row_count = len(digests)
+    record.content_hash = content_hash(digests)
+    record.imported_at = datetime.now(timezone.utc)
+    db.flush()
+
+    if active_version(db) is not None:
+        return False
+    set_active_version(db, version)
+    return True
+
+
+def set_active_version(db, version):
+    """Point the catalog at another loaded version; the caller commits and bumps the revision."""
+    if db.get(models.DatasetVersion, version) is None:
+        raise KeyError(f"Unknown dataset version: {version}")
+    result = db.execute(
+        update(models.CatalogRevision)
+        .where(models.CatalogRevision.id == _ROW_ID)
+        .values(active_version=version)
+    )
+    if result.rowcount == 0:
+        db.add(models.CatalogRevision(id=_ROW_ID, revision=0, active_version=version))
+
+
+def list_versions(db):
+    current = active_version(db)
+    versions = db.query(models.DatasetVersion).all()
+    versions.sort(key=lambda record: version_sort_key(record.version))
+    return [
+        {
+            "version": record.version,
+            "row_count": record.row_count,
+            "content_hash": record.content_hash,
+            "imported_at": record.imported_at,
+            "active": record.version == current,
+        }
+        for record in versions
+    ]
+
+
+class DatasetDiffer:
+    """Hash-based diff of the SKUs in two dataset versions, cached by content hash."""
+
+    def __init__(self, max_cached=MAX_CACHED_DIFFS):
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def diff(self, db, base, target):
+        records = {
+            version: db.get(models.DatasetVersion, version) for version in (base, target)
+        }
+        for version, record in records.items():
+            if record is None:
+                raise KeyError(f"Unknown dataset version: {version}")
+
+        key = (records[base].content_hash, records[target].content_hash)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return dict(self._cache[key], base=base, target=target)
+
+        if key[0] == key[1]:
+            result = {"identical": True, "added": [], "removed": [], "changed": []}
+        else:
+            result = self._compare(version_digests(db, base), version_digests(db, target))
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return dict(result, base=base, target=target)
+
+    @staticmethod
+    def _compare(old, new):
+        changed = []
+        for product in sorted(old.keys() & new.keys()):
+            old_digest, old_values, old_columns = old[product]
+            new_digest, new_values, new_columns = new[product]
+            if old_digest != new_digest:
+                fields = [
+                    name for i, (name, before, after) in enumerate(zip(DIFF_COLUMNS, old_values, new_values))
+                    if before != after and i in old_columns and i in new_columns
+                ]
+                if fields:
+                    changed.append({"product": product, "fields": fields})
+        return {
+            "identical": False,
+            "added": sorted(new.keys() - old.keys()),
+            "removed": sorted(old.keys() - new.keys()),
+            "changed": changed,
+        }
+
+
+dataset_differ = DatasetDiffer()
@@ -0,0 +1,109 @@
+import numpy as np
+
+# Share of TDP drawn by an allocated but idle CPU under the default linear model
+DEFAULT_IDLE_FRACTION = 0.3
+
+JOULES_PER_WATT_HOUR = 3600.0
+
+
+class PowerModel:
+    """Maps CPU utilization (0..1) to a fraction of TDP.
+
+    The curve is piecewise linear through (utilization_points, power_fractions),
+    so measured curves such as SPECpower results can be plugged in directly.
+    The default is a straight line from idle_fraction at 0% to 1.0 at 100%.
+    """
+
+    def __init__(self, utilization_points=None, power_fractions=None, idle_fraction=DEFAULT_IDLE_FRACTION):
+        if utilization_points is None:
+            utilization_points, power_fractions = (0.0, 1.0), (idle_fraction, 1.0)
+        self.utilization_points = np.asarray(utilization_points, dtype=np.float64)
+        self.power_fractions = np.asarray(power_fractions, dtype=np.float64)
+        if self.utilization_points.shape != self.power_fractions.shape:
+            raise ValueError("utilization_points and power_fractions must have the same length")
+        if np.any(np.diff(self.utilization_points) <= 0):
+            raise ValueError("utilization_points must be strictly increasing")
+
+    def power_fraction(self, utilization):
+        return np.interp(np.clip(utilization, 0.0, 1.0), self.utilization_points, self.power_fractions)
+
+
+def factorize(names):
+    """Return (distinct names in first-seen order, code per name) using a hash map.
+
+    Faster than np.unique for Python strings since nothing has to be sorted.
+    """
+    codes = {}
+    inverse = np.fromiter(
+        (codes.setdefault(name, len(codes)) for name in names), dtype=np.int64, count=len(names)
+    )
+    return list(codes), inverse
+
+
+class EnergyEstimator:
+    """Vectorized energy estimates for batches of invocations.
+
+    tdp_lookup is a callable mapping a processor name to its TDP in watts, or
+    None when unknown. It is called once per distinct name in a batch.
+    """
+
+    def __init__(self, tdp_lookup, power_model=None):
+        self.tdp_lookup = tdp_lookup
+        self.power_model = power_model or PowerModel()
+
+    def estimate(self, processors, vcpu_share, utilization, duration_s):
+        """Estimate energy for invocation arrays.
+
+        processors: processor name per invocation.
+        vcpu_share: fraction of the processor package allotted to the invocation.
+        utilization: average CPU utilization of that allotment (0..1).
+        duration_s: run time in seconds.
+        Scalars broadcast over all invocations. Invocations whose processor has no
+        known TDP get NaN energy and are listed in "missing".
+        """
+        unique_names, inverse = factorize(processors)
+
+        unique_tdp = np.array(
+            [self._tdp(name) for name in unique_names], dtype=np.float64
+        )
+        tdp = unique_tdp[inverse]
+        # Raises ValueError if an array doesn't match the number of invocations
+        share, util, duration = (
+            np.broadcast_to(np.asarray(values, dtype=np.float64), inverse.shape)
+            for values in (vcpu_share, utilization, duration_s)
+        )
+
+        joules = tdp * share * self.power_model.power_fraction(util) * duration
+        known = ~np.isnan(joules)
+
+        per_processor = np.bincount(inverse, weights=np.where(known, joules, 0.0), minlength=len(unique_names))
+        return {
+            "joules": joules,
+            "watt_hours": joules / JOULES_PER_WATT_HOUR,
+            "total_joules": float(joules[known].sum()),
+            "total_watt_hours": float(joules[known].sum() / JOULES_PER_WATT_HOUR),
+            "by_processor": {
+                str(name): float(total)
+                for name, total, tdp_value in zip(unique_names, per_processor, unique_tdp)
+                if not np.isnan(tdp_value)
+            },
+            "missing": [str(name) for name, tdp_value in zip(unique_names, unique_tdp) if np.isnan(tdp_value)],
+            "estimated": int(known.sum()),
+        }
+
+    def _tdp(self, name):
+        tdp = self.tdp_lookup(name)
+        return np.nan if tdp is None else float(tdp)
+
+
+def tdp_lookup_from_index(index, resolve_names=False, min_score=None):
+    """Build a tdp_lookup callable backed by the in-memory TDPIndex."""
+    def lookup(name):
+        found, tdp = index.lookup(name)
+        if found or not resolve_names:
+            return tdp
+        product, tdp, score = index.resolve(name)
+        if product is None or (min_score is not None and score < min_score):
+            return None
+        return tdp
+    return lookup
@@ -0,0 +1,113 @@
+import csv
+import io
+import time
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from . import models
+from .normalize import PROCESSOR_COLUMNS, iter_normalized
+
+# Rows buffered per COPY / INSERT batch; bounds memory regardless of upload size
+INGEST_BATCH_SIZE = 5000
+
+# NULL marker used in the COPY stream so empty strings stay empty strings
+COPY_NULL = "\\N"
+
+
+def iter_batches(binary_file, batch_size=INGEST_BATCH_SIZE, report=None):
+    """Parse a binary CSV stream incrementally, yielding lists of parsed rows.
+
+    Rejected rows and values are recorded in report, if given.
+    """
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        for chunk in iter_normalized(text, batch_size, report):
+            yield chunk.rows()
+    finally:
+        # Don't let the wrapper close the caller's file
+        text.detach()
+
+
+def _copy_batch(cursor, batch, columns=PROCESSOR_COLUMNS):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for values in batch:
+        writer.writerow([COPY_NULL if value is None else value for value in values])
+    buffer.seek(0)
+    statement = (
+        f"COPY {models.Processor.__tablename__} ({', '.join(columns)}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+    try:
+        cursor.copy_expert(statement, buffer)
+    except cursor.connection.IntegrityError as e:
+        # Raw cursor errors bypass SQLAlchemy; surface them like the INSERT path does
+        raise IntegrityError(statement, None, e) from e
+
+
+def _insert_batch(db, batch, columns=PROCESSOR_COLUMNS):
+    db.execute(
+        insert(models.Processor.__table__),
+        [dict(zip(columns, values)) for values in batch],
+    )
+
+
+def _first_per_product(batch, products):
+    """Rows of batch whose product is not in products yet; adds them to it."""
+    for values in batch:
+        if values[0] not in products:
+            products.add(values[0])
+            yield values
+
+
+def bulk_load_csv(db, binary_file, batch_size=INGEST_BATCH_SIZE, on_batch=None, commit=True,
+                  dataset_version=None, report=None, source_file=None):
+    """Stream a CSV into the processors table in one transaction.
+
+    Uses COPY FROM STDIN on PostgreSQL and multi-row INSERT batches elsewhere.
+    on_batch, if given, is called with every parsed batch. Pass commit=False to
+    leave the transaction open for follow-up writes. Rows are tagged with
+    dataset_version when given, keeping the first row per product since
+    (product, dataset_version) is unique; a product already loaded in that
+    version raises IntegrityError. source_file, if given, records the file the
+    rows came from. Values the normalizer rejected are recorded in report (a
+    RejectReport).
+    Returns the number of rows loaded and the elapsed time in seconds.
+    """
+    started = time.perf_counter()
+    total_rows = 0
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    columns = PROCESSOR_COLUMNS
+    tags = ()
+    if dataset_version is not None:
+        columns += ("dataset_version",)
+        tags += (dataset_version,)
+    if source_file is not None:
+        columns += ("source_file",)
+        tags += (source_file,)
+
+    cursor = db.connection().connection.cursor() if use_copy else None
+    products = set()
+    try:
+        for batch in iter_batches(binary_file, batch_size, report):
+            # Appended last, so on_batch still sees PROCESSOR_COLUMNS positions
+            if dataset_version is not None:
+                batch = list(_first_per_product(batch, products))
+                if not batch:
+                    # Every row repeated an earlier product; an empty INSERT would add a NULL row
+                    continue
+            if tags:
+                batch = [values + tags for values in batch]
+            if use_copy:
+                _copy_batch(cursor, batch, columns)
+            else:
+                _insert_batch(db, batch, columns)
+            if on_batch is not None:
+                on_batch(batch)
+            total_rows += len(batch)
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+    if commit:
+        db.commit()
+    return total_rows, time.perf_counter() - started
@@ -1,14 +1,58 @@
-from fastapi import FastAPI, Depends, HTTPException, File
+from fastapi import FastAPI, Depends, HTTPException, File, UploadFile, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
+import logging
+import os
+import time
 from . import models, schemas
-from .database import engine, get_db
-import csv
-from io import StringIO
+from .database import (
+    engine, get_db, SessionLocal, get_read_db, fetch_all, fetch_one, fetch_rows, pool_stats,
+    on_engine_created
+)
+from .tdp_index import tdp_index
+from .name_resolver import DEFAULT_MIN_SCORE
+from .ingest import bulk_load_csv
+from .normalize import RejectReport, parse_release_bound
+from .migrations import migrate, DB_AUTO_MIGRATE
+from .memory_support import sync_memory_support, supports_memory_clause
+from .caching import catalog_revision, REVALIDATE_BEFORE_ROUTING, UNCACHED_PATH_PREFIXES
+from .columnar import columnar_catalog
+from .energy import EnergyEstimator, PowerModel, tdp_lookup_from_index
+from .summaries import (
+    summary_cache, SummaryAccumulator, merge_summaries, rebuild_summaries, SUMMARY_DIMENSIONS
+)
+from .datasets import (
+    dataset_differ, list_versions, register_version, set_active_version, active_version,
+    resolve_version, scope_to_version
+)
+from .metrics import metrics, METRICS_ENABLED, route_template
+from .snapshot import snapshot_key, load_snapshot, save_snapshot
+from .text_search import text_search_index, trigram_search_query, MAX_RESULTS as MAX_TEXT_SEARCH_RESULTS
+from .similarity import (
+    similarity_index, neighbour_response, FEATURES as SIMILARITY_FEATURES, MAX_NEIGHBOURS,
+    MIN_SHARED_FEATURES
+)
+from .pagination import (
+    MAX_PAGE_SIZE, STREAM_BATCH_SIZE, InvalidCursor, encode_cursor, decode_cursor
+)
 
 app = FastAPI()
 
+# Maximum number of processor names accepted by the batch TDP endpoint
+MAX_TDP_BATCH_SIZE = 1000
+
+# Maximum number of invocations accepted by the energy estimation endpoint
+MAX_ENERGY_INVOCATIONS = 1000000
+
+# PostgreSQL answers text search from its pg_trgm GIN index, other databases
+# from the in-memory trigram index
+TRIGRAM_SEARCH = engine.dialect.name == "postgresql"
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -18,75 +62,552 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-models.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger("uvicorn.error")
+
+# Schema changes are an explicit deploy step (python -m src.backend.migrations)
+# rather than round trips on every cold start
+if DB_AUTO_MIGRATE:
+    migrate(engine)
+
+def ensure_built(store):
+    # Build lazily if a request arrives before the startup hook has run
+    if not store.ready:
+        db = SessionLocal()
+        try:
+            store.rebuild(db)
+        finally:
+            db.close()
+    return store
+
+def get_tdp_index():
+    return ensure_built(tdp_index)
+
+def get_columnar_catalog():
+    return ensure_built(columnar_catalog).catalog
+
+def get_summaries():
+    return ensure_built(summary_cache).by_dimension
+
+def get_text_search_index():
+    return ensure_built(text_search_index)
+
+def get_similarity_index():
+    return ensure_built(similarity_index)
+
+def refresh_catalog_revision(force=False):
+    db = SessionLocal()
+    try:
+        catalog_revision.refresh(db, force=force)
+    finally:
+        db.close()
+
+# In-memory stores built from the catalog and saved in the local snapshot
+CATALOG_STORES = {
+    "tdp_index": tdp_index,
+    "columnar_catalog": columnar_catalog,
+    "summary_cache": summary_cache,
+    "similarity_index": similarity_index,
+}
+if not TRIGRAM_SEARCH:
+    CATALOG_STORES["text_search_index"] = text_search_index
+
+# Seconds spent in each startup phase, filled in by warm_caches()
+startup_report = {}
+
+def save_catalog_snapshot(db):
+    save_snapshot(CATALOG_STORES, snapshot_key(db))
+
+# Imports done by the standalone scripts bump the revision; pick up their data too
+for store in CATALOG_STORES.values():
+    catalog_revision.on_change(store.rebuild)
+catalog_revision.on_change(save_catalog_snapshot)
+
+@app.on_event("startup")
+def warm_caches():
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        catalog_revision.refresh(db, force=True)
+        key = snapshot_key(db)
+        startup_report["catalog_revision"] = time.perf_counter() - started
+
+        phase_started = time.perf_counter()
+        if load_snapshot(CATALOG_STORES, key):
+            startup_report["snapshot_load"] = time.perf_counter() - phase_started
+        else:
+            for name, store in CATALOG_STORES.items():
+                phase_started = time.perf_counter()
+                store.rebuild(db)
+                startup_report[name] = time.perf_counter() - phase_started
+            phase_started = time.perf_counter()
+            save_snapshot(CATALOG_STORES, key)
+            startup_report["snapshot_save"] = time.perf_counter() - phase_started
+    finally:
+        db.close()
+    startup_report["total"] = time.perf_counter() - started
+    logger.info(
+        "Catalog caches ready in %.3fs (%s)", startup_report["total"],
+        ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in startup_report.items() if phase != "total")
+    )
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    # Catalog reads only change with the catalog revision, so validators derived
+    # from it let clients revalidate with a 304 that never reaches a route
+    if request.method != "GET" or request.url.path.startswith(UNCACHED_PATH_PREFIXES):
+        return await call_next(request)
+
+    if catalog_revision.stale:
+        await run_in_threadpool(refresh_catalog_revision)
+
+    headers = catalog_revision.cache_headers()
+    not_modified = catalog_revision.not_modified(request.headers)
+    if not_modified and request.url.path in REVALIDATE_BEFORE_ROUTING:
+        return Response(status_code=304, headers=headers)
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        if not_modified:
+            # The resource exists and hasn't changed since the client's copy
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return response
+
+async def record_metrics(request: Request, call_next):
+    # Outermost middleware, so 304s from conditional_get are measured too
+    method = request.method
+    route = route_template(app.router.routes, request.scope)
+    token = metrics.start_request(method, route)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.finish_request(method, route, status, time.perf_counter() - started, token)
+
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Only instrument the app when metrics are enabled, so a disabled deployment
+# runs no extra middleware or engine listeners
+if METRICS_ENABLED:
+    app.middleware("http")(record_metrics)
+    app.add_api_route("/metrics", get_metrics, methods=["GET"], include_in_schema=False)
+    on_engine_created(metrics.instrument_engine)
+    pool_stats.add_observer(metrics.pool_checkout_wait.observe)
+    metrics.add_gauge_callback(
+        "db_pool_checked_out", "Connections currently checked out of the pool.",
+        lambda: getattr(engine.pool, "checkedout", lambda: 0)()
+    )
 
 @app.get("/processors/", response_model=List[schemas.Processor])
-def get_processors(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    processors = db.query(models.Processor).offset(skip).limit(limit).all()
+async def get_processors(
+    skip: int = 0,
+    limit: int = 100,
+    dataset_version: Optional[str] = None,
+    db=Depends(get_read_db)
+):
+    query = scope_to_version(select(models.Processor), resolve_version(dataset_version))
+    processors = await fetch_all(db, query.offset(skip).limit(limit))
     return processors
 
+def filter_processors(query, status=None, code_name=None, ranges=None, dataset_version=None):
+    # Reads default to the active dataset version
+    query = scope_to_version(query, resolve_version(dataset_version))
+    if status is not None:
+        query = query.filter(models.Processor.status == status)
+    if code_name is not None:
+        query = query.filter(models.Processor.code_name == code_name)
+    # ranges maps a column name to inclusive (low, high) bounds, either may be None
+    for name, (low, high) in (ranges or {}).items():
+        column = getattr(models.Processor, name)
+        if low is not None:
+            query = query.filter(column >= low)
+        if high is not None:
+            query = query.filter(column <= high)
+    return query
+
+@app.get("/api/processors/page", response_model=schemas.ProcessorPage)
+async def get_processors_page(
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    status: Optional[str] = None,
+    code_name: Optional[str] = None,
+    dataset_version: Optional[str] = None,
+    db=Depends(get_read_db)
+):
+    # Keyset pagination on id: each page is an index range scan, however deep
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = filter_processors(select(models.Processor), status, code_name, dataset_version=dataset_version)
+    if cursor:
+        try:
+            query = query.filter(models.Processor.id > decode_cursor(cursor))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    processors = await fetch_all(db, query.order_by(models.Processor.id).limit(limit))
+    next_cursor = encode_cursor(processors[-1].id) if len(processors) == limit else None
+    return {"items": processors, "next_cursor": next_cursor}
+
+def release_bound(value, upper):
+    # Accept a quarter ("Q3'21") or a whole year ("2021") as a range bound
+    if value is None:
+        return None
+    try:
+        return parse_release_bound(value, upper)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/processors/search", response_model=List[schemas.Processor])
+async def search_processors(
+    min_cores: Optional[int] = None,
+    max_cores: Optional[int] = None,
+    min_threads: Optional[int] = None,
+    max_threads: Optional[int] = None,
+    min_lithography: Optional[float] = None,
+    max_lithography: Optional[float] = None,
+    min_base_freq: Optional[float] = None,
+    max_base_freq: Optional[float] = None,
+    min_turbo_freq: Optional[float] = None,
+    max_turbo_freq: Optional[float] = None,
+    min_tdp: Optional[int] = None,
+    max_tdp: Optional[int] = None,
+    min_cache: Optional[float] = None,
+    max_cache: Optional[float] = None,
+    released_from: Optional[str] = None,
+    released_to: Optional[str] = None,
+    memory_kind: Optional[str] = None,
+    min_memory_speed: Optional[int] = None,
+    status: Optional[str] = None,
+    code_name: Optional[str] = None,
+    dataset_version: Optional[str] = None,
+    sort: Literal[
+        "id", "product", "cores", "threads", "lithography", "base_freq",
+        "max_turbo_freq", "tdp", "cache", "release_quarter"
+    ] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = 100,
+    db=Depends(get_read_db)
+):
+    ranges = {
+        "cores": (min_cores, max_cores),
+        "threads": (min_threads, max_threads),
+        "lithography": (min_lithography, max_lithography),
+        "base_freq": (min_base_freq, max_base_freq),
+        "max_turbo_freq": (min_turbo_freq, max_turbo_freq),
+        "tdp": (min_tdp, max_tdp),
+        "cache": (min_cache, max_cache),
+        "release_quarter": (release_bound(released_from, False), release_bound(released_to, True)),
+    }
+    query = filter_processors(select(models.Processor), status, code_name, ranges, dataset_version)
+    if memory_kind is not None:
+        query = query.filter(supports_memory_clause(memory_kind, min_memory_speed))
+    elif min_memory_speed is not None:
+        raise HTTPException(status_code=400, detail="min_memory_speed requires memory_kind")
+
+    sort_column = getattr(models.Processor, sort)
+    sort_key = sort_column.desc() if order == "desc" else sort_column.asc()
+    query = query.order_by(sort_key.nulls_last(), models.Processor.id)
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return await fetch_all(db, query.limit(limit))
+
+@app.get("/api/processors/text-search", response_model=List[schemas.TextSearchHit])
+async def text_search_processors(q: str, limit: int = 20, db=Depends(get_read_db)):
+    # Ranked, typo-tolerant search over product, code name and integrated graphics
+    if len(q.strip()) < 2:
+        raise HTTPException(status_code=400, detail="q must be at least 2 characters")
+    limit = max(1, min(limit, MAX_TEXT_SEARCH_RESULTS))
+    if TRIGRAM_SEARCH:
+        rows = await fetch_rows(db, trigram_search_query(q, limit))
+        return [row._asdict() for row in rows]
+    return get_text_search_index().search(q, limit)
+
+@app.get("/api/processors/stream")
+def stream_processors(
+    status: Optional[str] = None,
+    code_name: Optional[str] = None,
+    dataset_version: Optional[str] = None
+):
+    def generate():
+        # The stream outlives the request dependencies, so it owns its session
+        db = SessionLocal()
+        try:
+            query = filter_processors(db.query(models.Processor), status, code_name, dataset_version=dataset_version)
+            query = query.order_by(models.Processor.id).yield_per(STREAM_BATCH_SIZE)
+            for processor in query:
+                yield schemas.Processor.model_validate(processor).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/processor/tdp/{processor_name}")
-def get_processor_tdp(processor_name: str, db: Session = Depends(get_db)):
-    processor = db.query(models.Processor).filter(models.Processor.product == processor_name).first()
-    if processor is None:
+def get_processor_tdp(processor_name: str):
+    found, tdp = get_tdp_index().lookup(processor_name)
+    if not found:
         raise HTTPException(status_code=404, detail="Processor not found")
     
     # Return a simple string response
-    from fastapi.responses import PlainTextResponse
-    return PlainTextResponse(f"The TDP of {processor.product} is {processor.tdp} watts")
+    return PlainTextResponse(f"The TDP of {processor_name} is {tdp} watts")
 
 @app.get("/api/processor/tdp/{processor_name}")
-def get_processor_tdp_json(processor_name: str, db: Session = Depends(get_db)):
-    processor = db.query(models.Processor).filter(models.Processor.product == processor_name).first()
-    if processor is None:
+def get_processor_tdp_json(processor_name: str):
+    found, tdp = get_tdp_index().lookup(processor_name)
+    if not found:
         raise HTTPException(status_code=404, detail="Processor not found")
     
     # Return a JSON response using JSONResponse
-    import json
-    from fastapi.responses import JSONResponse
-    from fastapi.encoders import jsonable_encoder
-    
     data = {
-        "processor": processor.product,
-        "tdp": processor.tdp
+        "processor": processor_name,
+        "tdp": tdp
     }
     
-    json_data = json.dumps(data)
-    return JSONResponse(content=json.loads(json_data))
+    return JSONResponse(content=data)
+
+@app.post("/api/processor/tdp/batch", response_model=schemas.TDPBatchResponse)
+def get_processor_tdp_batch(request: schemas.TDPBatchRequest):
+    if len(request.names) > MAX_TDP_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {MAX_TDP_BATCH_SIZE} names per request"
+        )
+
+    found, missing = get_tdp_index().lookup_many(request.names)
+    return {"found": found, "missing": missing}
+
+@app.get("/api/processor/resolve/{raw_name}", response_model=schemas.ProcessorResolution)
+def resolve_processor_name(raw_name: str, min_score: float = DEFAULT_MIN_SCORE):
+    product, tdp, score = get_tdp_index().resolve(raw_name)
+    if product is None or score < min_score:
+        raise HTTPException(status_code=404, detail="No matching processor found")
+    return {"query": raw_name, "processor": product, "tdp": tdp, "score": score}
+
+@app.post("/api/energy/estimate", response_model=schemas.EnergyEstimateResponse)
+def estimate_energy(request: schemas.EnergyEstimateRequest):
+    if len(request.processors) > MAX_ENERGY_INVOCATIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many invocations: at most {MAX_ENERGY_INVOCATIONS} per request"
+        )
+
+    try:
+        estimator = EnergyEstimator(
+            tdp_lookup_from_index(get_tdp_index(), request.resolve_names, DEFAULT_MIN_SCORE),
+            PowerModel(idle_fraction=request.idle_fraction)
+        )
+        result = estimator.estimate(
+            request.processors, request.vcpu_share, request.utilization, request.duration_s
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = {
+        "invocations": len(request.processors),
+        "estimated": result["estimated"],
+        "total_joules": result["total_joules"],
+        "total_watt_hours": result["total_watt_hours"],
+        "by_processor": result["by_processor"],
+        "missing": result["missing"],
+    }
+    if request.per_invocation:
+        # NaN (unknown processor) is not valid JSON, send null instead
+        for key in ("joules", "watt_hours"):
+            values = result[key]
+            response[key] = [None if value != value else value for value in values.tolist()]
+    return response
+
+@app.get("/api/processors/similar", response_model=List[schemas.SimilarProcessor])
+def get_processors_similar_to_spec(
+    cores: Optional[int] = None,
+    threads: Optional[int] = None,
+    lithography: Optional[float] = None,
+    base_freq: Optional[float] = None,
+    max_turbo_freq: Optional[float] = None,
+    cache: Optional[float] = None,
+    tdp: Optional[int] = None,
+    k: int = 5
+):
+    # For CPUs missing from the catalog: the closest SKUs by whatever specs are known
+    spec = {
+        "cores": cores, "threads": threads, "lithography": lithography, "base_freq": base_freq,
+        "max_turbo_freq": max_turbo_freq, "cache": cache, "tdp": tdp,
+    }
+    if sum(value is not None for value in spec.values()) < MIN_SHARED_FEATURES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Give at least {MIN_SHARED_FEATURES} of: {', '.join(SIMILARITY_FEATURES)}"
+        )
+    k = max(1, min(k, MAX_NEIGHBOURS))
+    return [neighbour_response(row, distance) for row, distance in get_similarity_index().nearest(spec, k)]
+
+@app.get("/api/processors/{processor_id}/similar", response_model=List[schemas.SimilarProcessor])
+def get_similar_processors(processor_id: int, k: int = 5, db: Session = Depends(get_db)):
+    index = get_similarity_index()
+    spec = index.spec_of(processor_id)
+    if spec is None:
+        # Processors outside the active dataset version are compared by their stored specs
+        processor = db.get(models.Processor, processor_id)
+        if processor is None:
+            raise HTTPException(status_code=404, detail="Processor not found")
+        spec = {name: getattr(processor, name) for name in SIMILARITY_FEATURES}
+        spec["product"] = processor.product
+    k = max(1, min(k, MAX_NEIGHBOURS))
+    neighbours = index.nearest(spec, k, exclude_product=spec["product"])
+    return [neighbour_response(row, distance) for row, distance in neighbours]
 
 @app.get("/processors/{processor_id}", response_model=schemas.Processor)
-def get_processor(processor_id: int, db: Session = Depends(get_db)):
-    processor = db.query(models.Processor).filter(models.Processor.id == processor_id).first()
+async def get_processor(processor_id: int, db=Depends(get_read_db)):
+    processor = await fetch_one(db, select(models.Processor).filter(models.Processor.id == processor_id))
     if processor is None:
         raise HTTPException(status_code=404, detail="Processor not found")
     return processor
 
+def columnar_filters(
+    status: Optional[str] = None,
+    code_name: Optional[str] = None,
+    min_cores: Optional[int] = None,
+    max_cores: Optional[int] = None,
+    min_threads: Optional[int] = None,
+    max_threads: Optional[int] = None,
+    min_lithography: Optional[float] = None,
+    max_lithography: Optional[float] = None,
+    min_base_freq: Optional[float] = None,
+    max_base_freq: Optional[float] = None,
+    min_turbo_freq: Optional[float] = None,
+    max_turbo_freq: Optional[float] = None,
+    min_tdp: Optional[int] = None,
+    max_tdp: Optional[int] = None,
+    min_cache: Optional[float] = None,
+    max_cache: Optional[float] = None,
+    min_memory_size: Optional[int] = None,
+    max_memory_size: Optional[int] = None,
+    min_memory_speed: Optional[int] = None,
+    max_memory_speed: Optional[int] = None
+):
+    # Same filter names as /api/processors/search, as a columnar catalog mask
+    ranges = {
+        "cores": (min_cores, max_cores),
+        "threads": (min_threads, max_threads),
+        "lithography": (min_lithography, max_lithography),
+        "base_freq": (min_base_freq, max_base_freq),
+        "max_turbo_freq": (min_turbo_freq, max_turbo_freq),
+        "tdp": (min_tdp, max_tdp),
+        "cache": (min_cache, max_cache),
+        "max_memory_size": (min_memory_size, max_memory_size),
+        "max_memory_speed": (min_memory_speed, max_memory_speed),
+    }
+    ranges = {name: bounds for name, bounds in ranges.items() if bounds != (None, None)}
+    equals = {name: value for name, value in (("status", status), ("code_name", code_name)) if value is not None}
+    return get_columnar_catalog().mask(ranges=ranges, equals=equals)
+
+@app.get("/api/catalog/select")
+def select_catalog(
+    sort: Optional[str] = None,
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = 100,
+    mask=Depends(columnar_filters)
+):
+    # Filtered, sorted rows from the in-memory columnar catalog, no database round trip
+    catalog = get_columnar_catalog()
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    try:
+        positions = catalog.select(mask, sort, order == "desc", limit)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    return {"matched": int(mask.sum()), "items": catalog.rows(positions)}
+
+@app.get("/api/catalog/aggregate")
+def aggregate_catalog(
+    column: str,
+    func: str = "mean",
+    group_by: Optional[str] = None,
+    mask=Depends(columnar_filters)
+):
+    # Answered from the in-memory columnar catalog, no database round trip
+    catalog = get_columnar_catalog()
+    try:
+        result = catalog.aggregate(column, func, mask, group_by)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    return {"column": column, "func": func, "group_by": group_by, "result": result}
+
+@app.get("/api/stats")
+def get_stats(dimension: Optional[Literal[SUMMARY_DIMENSIONS]] = None):
+    # Precomputed at import time and held in memory, independent of catalog size
+    summaries = get_summaries()
+    if dimension is None:
+        return summaries
+    return {dimension: summaries.get(dimension, [])}
+
+@app.get("/api/pool/stats")
+def get_pool_stats():
+    return {"pool": engine.pool.status(), "checkout_wait": pool_stats.snapshot()}
+
+@app.get("/api/datasets", response_model=List[schemas.DatasetVersion])
+def get_dataset_versions(db: Session = Depends(get_db)):
+    return list_versions(db)
+
+@app.get("/api/datasets/diff", response_model=schemas.DatasetDiff)
+def diff_dataset_versions(base: str, target: Optional[str] = None, db: Session = Depends(get_db)):
+    target = target or active_version(db)
+    if target is None:
+        raise HTTPException(status_code=400, detail="No active dataset version, pass target")
+    try:
+        return dataset_differ.diff(db, base, target)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+@app.post("/api/datasets/{version}/activate")
+def activate_dataset_version(version: str, db: Session = Depends(get_db)):
+    # The version is already loaded next to the current one, so activation only
+    # moves the pointer; the in-memory indexes swap when the revision changes
+    try:
+        set_active_version(db, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    rebuild_summaries(db, version)
+    catalog_revision.bump(db)
+    return {"message": f"Dataset version {version} activated", "active_version": version}
+
 @app.post("/upload-csv/")
-async def upload_csv(file: bytes = File(...), db: Session = Depends(get_db)):
-    content = file.decode('utf-8')
-    csv_file = StringIO(content)
-    csv_reader = csv.DictReader(csv_file)
-    
-    for row in csv_reader:
-        processor = models.Processor(
-            product=row['Product'],
-            status=row['Status'],
-            release_date=row['Release Date'],
-            code_name=row['Code Name'],
-            cores=int(row['Cores']) if row['Cores'] != 'N/A' else None,
-            threads=int(row['Threads']) if row['Threads'] != 'N/A' else None,
-            lithography=float(row['Lithography(nm)']) if row['Lithography(nm)'] != 'N/A' else None,
-            max_turbo_freq=float(row['Max. Turbo Freq.(GHz)']) if row['Max. Turbo Freq.(GHz)'] != 'N/A' else None,
-            base_freq=float(row['Base Freq.(GHz)']) if row['Base Freq.(GHz)'] != 'N/A' else None,
-            tdp=int(float(row['TDP(W)'])) if row['TDP(W)'] != 'N/A' else None,
-            cache=float(row['Cache(MB)']) if row['Cache(MB)'] != 'N/A' else None,
-            cache_info=row['Cache Info'],
-            max_memory_size=int(float(row['Max Memory Size(GB)'])) if row['Max Memory Size(GB)'] != 'N/A' else None,
-            memory_types=row['Memory Types'],
-            max_memory_speed=int(row['Max Memory Speed(MHz)']) if row['Max Memory Speed(MHz)'] != 'N/A' else None,
-            integrated_graphics=row['Integrated Graphics']
+def upload_csv(
+    file: UploadFile = File(...),
+    dataset_version: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    # UploadFile spools to disk past a small threshold, so rows are parsed and
+    # loaded batch by batch without holding the whole file in memory
+    current_version = active_version(db)
+    version = dataset_version or current_version
+    last_id = db.query(func.max(models.Processor.id)).scalar()
+    summary = SummaryAccumulator()
+    report = RejectReport()
+    try:
+        rows, seconds = bulk_load_csv(
+            db, file.file, on_batch=summary.add_rows, commit=False, dataset_version=version,
+            report=report, source_file=os.path.basename(file.filename) if file.filename else None
         )
-        db.add(processor)
-    
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Products already exist in dataset version {version}")
+    # Fold the new rows into the stored summaries and memory support table in
+    # the same transaction
+    if version == current_version:
+        merge_summaries(db, summary)
+    sync_memory_support(db, after_id=last_id)
+    if version is not None and register_version(db, version):
+        # First versioned upload: it becomes the active version
+        rebuild_summaries(db, version)
     db.commit()
-    return {"message": "CSV data uploaded successfully"}
+    # Bumping the revision rebuilds the TDP index through its change listener
+    catalog_revision.bump(db)
+    return {
+        "message": "CSV data uploaded successfully",
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds > 0 else rows,
+        "rejected": report.as_dict()
+    }
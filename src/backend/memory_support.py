@@ -0,0 +1,39 @@
+from sqlalchemy import delete, exists, insert, select
+from . import models
+from .normalize import parse_memory_types
+
+
+def sync_memory_support(db, processor_ids=None, after_id=None):
+    """Parse memory_types into processor_memory_support.
+
+    Re-parses the given processor_ids, or fills in every processor (with id above
+    after_id, if given) that has no support rows yet. The caller commits.
+    Returns the number of support rows written.
+    """
+    support = models.ProcessorMemorySupport
+    query = select(models.Processor.id, models.Processor.memory_types)
+    if processor_ids is not None:
+        db.execute(delete(support).where(support.processor_id.in_(processor_ids)))
+        query = query.where(models.Processor.id.in_(processor_ids))
+    else:
+        query = query.where(~exists().where(support.processor_id == models.Processor.id))
+        if after_id is not None:
+            query = query.where(models.Processor.id > after_id)
+
+    rows = [
+        {"processor_id": processor_id, "memory_kind": kind, "speed_mts": speed}
+        for processor_id, memory_types in db.execute(query)
+        for kind, speed in parse_memory_types(memory_types).items()
+    ]
+    if rows:
+        db.execute(insert(support), rows)
+    return len(rows)
+
+
+def supports_memory_clause(memory_kind, min_speed=None):
+    """WHERE clause selecting processors that support memory_kind (at min_speed MT/s or more)."""
+    support = models.ProcessorMemorySupport
+    matching = select(support.processor_id).where(support.memory_kind == memory_kind.upper())
+    if min_speed is not None:
+        matching = matching.where(support.speed_mts >= min_speed)
+    return models.Processor.id.in_(matching)
@@ -0,0 +1,198 @@
+import bisect
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Instrumentation is only installed when enabled, so a disabled deployment pays nothing
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_STATEMENT_KIND_RE = re.compile(r"^\s*(\w+)")
+STATEMENT_KINDS = ("select", "insert", "update", "delete", "copy")
+
+# SQL seconds spent by the current request; a one-element list so threadpool
+# workers, which run in a copy of the request context, add to the same total
+_request_db_time = ContextVar("request_db_time", default=None)
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help_text, self.labels = name, help_text, labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *label_values):
+        self.inc(*label_values, amount=-1)
+
+    def collect(self):
+        lines = super().collect()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition format."""
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help_text, self.labels = name, help_text, labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Per-bucket counts (plus +Inf), sum
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in sorted(self._series.items())]
+        for label_values, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics exposed at /metrics."""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "Request latency by route.", ("method", "route")
+        )
+        self.request_db_time = Histogram(
+            "http_request_db_seconds", "Time a request spent executing SQL, by route.",
+            ("method", "route"), DB_BUCKETS
+        )
+        self.requests = Counter(
+            "http_requests_total", "Requests by route and status code.", ("method", "route", "status")
+        )
+        self.in_flight = Gauge(
+            "http_requests_in_flight", "Requests currently being served, by route.", ("method", "route")
+        )
+        self.statement_duration = Histogram(
+            "db_statement_duration_seconds", "SQL statement execution time by statement kind.",
+            ("kind",), DB_BUCKETS
+        )
+        self.pool_checkout_wait = Histogram(
+            "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", (), DB_BUCKETS
+        )
+        self._collectors = [
+            self.request_duration, self.request_db_time, self.requests, self.in_flight,
+            self.statement_duration, self.pool_checkout_wait,
+        ]
+        self._gauge_callbacks = []
+
+    def add_gauge_callback(self, name, help_text, callback):
+        """Expose a gauge whose value is read from callback() at scrape time."""
+        self._gauge_callbacks.append((name, help_text, callback))
+
+    def render(self):
+        lines = []
+        for collector in self._collectors:
+            lines.extend(collector.collect())
+        for name, help_text, callback in self._gauge_callbacks:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {callback()}"])
+        return "\n".join(lines) + "\n"
+
+    def instrument_engine(self, engine):
+        """Time every statement run on a (sync) engine through cursor execute events.
+
+        Failed statements are not timed.
+        """
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+            self.statement_duration.observe(elapsed, statement_kind(statement))
+            request_time = _request_db_time.get()
+            if request_time is not None:
+                request_time[0] += elapsed
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            # A failed execute never reaches after_cursor_execute; drop its start
+            # time so it isn't left on the pooled connection
+            conn = exception_context.connection
+            if conn is None or exception_context.statement is None:
+                return
+            started = conn.info.get("statement_started")
+            if started:
+                started.pop()
+
+    def start_request(self, method, route):
+        self.in_flight.inc(method, route)
+        return _request_db_time.set([0.0])
+
+    def finish_request(self, method, route, status, elapsed, token):
+        db_time = _request_db_time.get()[0]
+        _request_db_time.reset(token)
+        self.in_flight.dec(method, route)
+        self.request_duration.observe(elapsed, method, route)
+        self.request_db_time.observe(db_time, method, route)
+        self.requests.inc(method, route, str(status))
+
+
+def statement_kind(statement):
+    match = _STATEMENT_KIND_RE.match(statement)
+    kind = match.group(1).lower() if match else ""
+    return kind if kind in STATEMENT_KINDS else "other"
+
+
+def route_template(routes, scope):
+    """The path template of the route matching scope, keeping label cardinality bounded."""
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,168 @@
+import os
+import time
+from sqlalchemy import bindparam, inspect, text, update
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+from . import models
+from .database import engine as default_engine
+from .normalize import parse_release_quarter
+from .memory_support import sync_memory_support
+from .summaries import rebuild_summaries
+from .datasets import active_version
+from .text_search import SEARCH_DOCUMENT_SQL
+
+
+def add_release_quarter(engine):
+    """Add processors.release_quarter to older databases and backfill it from release_date."""
+    columns = {column["name"] for column in inspect(engine).get_columns("processors")}
+    with engine.begin() as conn:
+        if "release_quarter" not in columns:
+            conn.execute(text("ALTER TABLE processors ADD COLUMN release_quarter INTEGER"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_processors_release_quarter ON processors (release_quarter)"
+            ))
+
+        pending = conn.execute(
+            text("SELECT id, release_date FROM processors "
+                 "WHERE release_quarter IS NULL AND release_date IS NOT NULL")
+        ).all()
+        updates = [
+            {"row_id": row_id, "quarter": quarter}
+            for row_id, release_date in pending
+            if (quarter := parse_release_quarter(release_date)) is not None
+        ]
+        if updates:
+            table = models.Processor.__table__
+            conn.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(release_quarter=bindparam("quarter")),
+                updates,
+            )
+    return len(updates)
+
+
+# Declared on models.Processor; setup_search_indexes() in the import script creates the same ones
+SEARCH_INDEXES = (
+    "idx_processors_status_cores", "idx_processors_status_lithography", "idx_processors_code_name",
+    "idx_processors_turbo_desc", "idx_processors_tdp",
+)
+
+
+def add_search_indexes(engine):
+    """Create the /api/processors/search indexes on databases created before them."""
+    with engine.begin() as conn:
+        for index in models.Processor.__table__.indexes:
+            if index.name in SEARCH_INDEXES:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def add_dataset_versions(engine):
+    """Add the dataset version columns to databases created before versioned imports."""
+    inspector = inspect(engine)
+    processor_columns = {column["name"] for column in inspector.get_columns("processors")}
+    revision_columns = {column["name"] for column in inspector.get_columns("catalog_revision")}
+    with engine.begin() as conn:
+        if "dataset_version" not in processor_columns:
+            conn.execute(text("ALTER TABLE processors ADD COLUMN dataset_version VARCHAR(32)"))
+        if "source_file" not in processor_columns:
+            conn.execute(text("ALTER TABLE processors ADD COLUMN source_file VARCHAR(255)"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_processors_dataset_version "
+            "ON processors (dataset_version, product)"
+        ))
+        if "active_version" not in revision_columns:
+            conn.execute(text("ALTER TABLE catalog_revision ADD COLUMN active_version VARCHAR(32)"))
+
+
+def add_natural_key(engine):
+    """Make (product, dataset_version) unique, dropping duplicate versioned rows first.
+
+    Repeated uploads to one version used to load the same products again; the
+    first row per product is kept. Returns the number of rows removed.
+    """
+    with Session(engine) as db:
+        duplicates = db.execute(text(
+            "SELECT id FROM processors p WHERE dataset_version IS NOT NULL AND EXISTS ("
+            "SELECT 1 FROM processors q WHERE q.product = p.product "
+            "AND q.dataset_version = p.dataset_version AND q.id < p.id)"
+        )).scalars().all()
+        if duplicates:
+            db.query(models.ProcessorMemorySupport).filter(
+                models.ProcessorMemorySupport.processor_id.in_(duplicates)
+            ).delete(synchronize_session=False)
+            db.query(models.Processor).filter(
+                models.Processor.id.in_(duplicates)
+            ).delete(synchronize_session=False)
+            rebuild_summaries(db, active_version(db))
+        db.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_processors_natural_key "
+            "ON processors (product, dataset_version)"
+        ))
+        db.commit()
+    return len(duplicates)
+
+
+def backfill_memory_support(engine):
+    """Parse memory_types for processors loaded before processor_memory_support existed."""
+    with Session(engine) as db:
+        if db.query(models.ProcessorMemorySupport.processor_id).first() is not None:
+            return 0
+        written = sync_memory_support(db)
+        db.commit()
+    return written
+
+
+def backfill_summaries(engine):
+    """Compute processor_summaries for catalogs loaded before it existed."""
+    with Session(engine) as db:
+        if db.query(models.ProcessorSummary.key).first() is not None:
+            return
+        if db.query(models.Processor.id).first() is None:
+            return
+        rebuild_summaries(db, active_version(db))
+        db.commit()
+
+
+def add_text_search_index(engine):
+    """Create the pg_trgm GIN index behind /api/processors/text-search on PostgreSQL.
+
+    Other databases use the in-memory index in text_search.py instead.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_processors_search_trgm "
+            f"ON processors USING gin ({SEARCH_DOCUMENT_SQL} gin_trgm_ops)"
+        ))
+
+
+MIGRATIONS = [
+    add_release_quarter, add_search_indexes, add_dataset_versions, add_natural_key, backfill_memory_support,
+    backfill_summaries, add_text_search_index,
+]
+
+
+def run_migrations(engine):
+    for migration in MIGRATIONS:
+        migration(engine)
+
+
+# Create and migrate the schema when the app starts instead of as a separate
+# step; convenient for development, but it adds database round trips to every cold start
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "false").lower() in ("1", "true", "yes")
+
+
+def migrate(engine=default_engine):
+    """Create missing tables and apply every migration; safe to run repeatedly."""
+    models.Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+
+if __name__ == "__main__":
+    # python -m src.backend.migrations
+    started = time.perf_counter()
+    migrate()
+    print(f"Database schema is up to date ({time.perf_counter() - started:.2f}s)")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean
+from sqlalchemy import Column, ForeignKey, Index, Integer, BigInteger, String, Float, Boolean, DateTime, text
 from .database import Base
 
 class Processor(Base):
@@ -20,4 +20,76 @@ class Processor(Base):
     max_memory_size = Column(Integer)
     memory_types = Column(String)
     max_memory_speed = Column(Integer)
-    integrated_graphics = Column(String)
\ No newline at end of file
+    integrated_graphics = Column(String)
+    # release_date parsed as year*4+quarter so date ranges and ordering can use an index
+    release_quarter = Column(Integer)
+    # Catalog snapshot the row belongs to (e.g. "v1_8"); NULL for unversioned imports
+    dataset_version = Column(String(32))
+    source_file = Column(String(255))
+
+    # Indexes behind /api/processors/search; add_search_indexes() in migrations.py adds
+    # them to existing databases. Keep in sync with setup_search_indexes() in
+    # import_csv_to_vercel_postgres.py
+    __table_args__ = (
+        Index("idx_processors_status_cores", "status", "cores"),
+        Index(
+            "idx_processors_status_lithography", "status", "lithography",
+            postgresql_include=["cores", "max_turbo_freq", "product"]
+        ),
+        Index("idx_processors_code_name", "code_name"),
+        Index(
+            "idx_processors_turbo_desc", text("max_turbo_freq DESC"),
+            postgresql_where=text("max_turbo_freq IS NOT NULL"),
+            sqlite_where=text("max_turbo_freq IS NOT NULL")
+        ),
+        Index("idx_processors_tdp", "tdp"),
+        Index("idx_processors_release_quarter", "release_quarter"),
+        Index("idx_processors_dataset_version", "dataset_version", "product"),
+        # Natural key; unversioned rows have a NULL version and never conflict
+        Index("idx_processors_natural_key", "product", "dataset_version", unique=True),
+    )
+
+class CatalogRevision(Base):
+    """Single-row counter bumped whenever the processor catalog is (re)imported."""
+    __tablename__ = "catalog_revision"
+
+    id = Column(Integer, primary_key=True)
+    revision = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True))
+    # Dataset version served by default; NULL serves every row
+    active_version = Column(String(32))
+
+class DatasetVersion(Base):
+    """One row per imported dataset version with a hash of its content."""
+    __tablename__ = "dataset_versions"
+
+    version = Column(String(32), primary_key=True)
+    row_count = Column(Integer, nullable=False, default=0)
+    content_hash = Column(String(64), nullable=False)
+    imported_at = Column(DateTime(timezone=True))
+
+class ProcessorSummary(Base):
+    """Precomputed per-group aggregates served by /api/stats."""
+    __tablename__ = "processor_summaries"
+
+    dimension = Column(String(32), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    processors = Column(Integer, nullable=False, default=0)
+    cores_sum = Column(BigInteger, nullable=False, default=0)
+    cores_count = Column(Integer, nullable=False, default=0)
+    tdp_sum = Column(BigInteger, nullable=False, default=0)
+    tdp_count = Column(Integer, nullable=False, default=0)
+    max_turbo_freq = Column(Float)
+
+class ProcessorMemorySupport(Base):
+    """One row per memory kind a processor supports, parsed from memory_types."""
+    __tablename__ = "processor_memory_support"
+
+    processor_id = Column(Integer, ForeignKey("processors.id", ondelete="CASCADE"), primary_key=True)
+    memory_kind = Column(String(16), primary_key=True)
+    speed_mts = Column(Integer)
+
+    # "supports DDR5 at >= 5200 MT/s" is a range scan that never touches processors
+    __table_args__ = (
+        Index("idx_memory_support_kind_speed", "memory_kind", "speed_mts", "processor_id"),
+    )
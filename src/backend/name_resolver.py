@@ -0,0 +1,161 @@
+import re
+from collections import defaultdict
+
+# Vendor decorations that appear in /proc/cpuinfo style model strings but not in the catalog
+_NOISE_PATTERNS = [
+    r"\((r|tm|c)\)",
+    r"[®™©]",
+    r"@\s*[\d.]+\s*[gm]hz",
+    r"\b\d+(st|nd|rd|th)\s+gen(eration)?\b",
+    r"\bintel\b",
+    r"\bcpu\b",
+    r"\bprocessor\b",
+    r"\bwith\b",
+]
+_NOISE_RE = re.compile("|".join(_NOISE_PATTERNS))
+_INVALID_CHARS_RE = re.compile(r"[^a-z0-9+\- ]")
+_SPACES_RE = re.compile(r"\s+")
+_STEM_RE = re.compile(r"^[a-z]*\d+")
+
+# Stems with this many digits are model numbers ("8259", "n4020"); "i7" or "v4" are not
+MODEL_NUMBER_DIGITS = 3
+
+# Default confidence below which a resolution is treated as "not found"
+DEFAULT_MIN_SCORE = 0.6
+
+# Trigrams shared by more than this fraction of the catalog are too common to narrow the search
+COMMON_TRIGRAM_RATIO = 0.05
+
+MAX_CANDIDATES = 50
+MAX_CACHED_RESOLUTIONS = 4096
+
+
+def normalize_name(name):
+    """Lowercase a processor name and strip vendor noise such as (R), CPU and @ 2.50GHz."""
+    lowered = name.lower()
+    cleaned = _NOISE_RE.sub(" ", lowered)
+    cleaned = _INVALID_CHARS_RE.sub(" ", cleaned)
+    cleaned = _SPACES_RE.sub(" ", cleaned).strip()
+    # Names that are nothing but noise (e.g. "Intel Processor") keep their plain form
+    return cleaned or _SPACES_RE.sub(" ", lowered).strip()
+
+
+def _tokens(normalized):
+    return [token for token in re.split(r"[ \-]", normalized) if token]
+
+
+def _model_stems(normalized):
+    """Return the numeric model stems of a name, e.g. "i9-14900ks" -> {"i9", "14900"}."""
+    stems = set()
+    for token in _tokens(normalized):
+        if any(ch.isdigit() for ch in token):
+            match = _STEM_RE.match(token)
+            stems.add(match.group(0) if match else token)
+    return stems
+
+
+def _model_numbers(stems):
+    return {stem for stem in stems if sum(ch.isdigit() for ch in stem) >= MODEL_NUMBER_DIGITS}
+
+
+def _trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameResolver:
+    """Maps raw CPU model strings onto catalog product names via token and trigram indexes."""
+
+    def __init__(self, names):
+        self.names = []
+        self._exact = {}
+        self._trigram_sets = []
+        self._stem_sets = []
+        self._stem_postings = defaultdict(list)
+        self._trigram_postings = defaultdict(list)
+        self._cache = {}
+
+        for name in names:
+            normalized = normalize_name(name)
+            if normalized in self._exact:
+                continue
+
+            name_id = len(self.names)
+            self.names.append(name)
+            self._exact[normalized] = name_id
+
+            trigrams = _trigrams(normalized)
+            self._trigram_sets.append(trigrams)
+            for trigram in trigrams:
+                self._trigram_postings[trigram].append(name_id)
+            stems = _model_stems(normalized)
+            self._stem_sets.append(stems)
+            for stem in stems:
+                self._stem_postings[stem].append(name_id)
+
+        self._common_trigram_limit = max(1, int(len(self.names) * COMMON_TRIGRAM_RATIO))
+
+    def _score(self, query_trigrams, name_id):
+        # Dice coefficient over character trigrams
+        candidate = self._trigram_sets[name_id]
+        shared = len(query_trigrams & candidate)
+        return 2.0 * shared / (len(query_trigrams) + len(candidate))
+
+    def _trigram_candidates(self, query_trigrams):
+        postings = [self._trigram_postings[t] for t in query_trigrams if t in self._trigram_postings]
+        selective = [p for p in postings if len(p) <= self._common_trigram_limit]
+
+        counts = defaultdict(int)
+        for posting in selective or postings:
+            for name_id in posting:
+                counts[name_id] += 1
+        return sorted(counts, key=counts.get, reverse=True)[:MAX_CANDIDATES]
+
+    def _best_match(self, query_trigrams, candidates, model_numbers):
+        # A different model number is a different chip (8259CL is not an 8253), however
+        # similar the names look, so candidates must carry every model number of the query
+        best_id, best_score = None, 0.0
+        for name_id in candidates:
+            if not model_numbers <= self._stem_sets[name_id]:
+                continue
+            score = self._score(query_trigrams, name_id)
+            if score > best_score:
+                best_id, best_score = name_id, score
+        return best_id, best_score
+
+    def resolve(self, raw_name):
+        """Return (product, score) for the closest catalog name, or (None, 0.0)."""
+        cached = self._cache.get(raw_name)
+        if cached is not None:
+            return cached
+
+        normalized = normalize_name(raw_name)
+        if normalized in self._exact:
+            result = (self.names[self._exact[normalized]], 1.0)
+        else:
+            query_trigrams = _trigrams(normalized)
+
+            stems = _model_stems(normalized)
+            model_numbers = _model_numbers(stems)
+            candidates = set()
+            for stem in stems:
+                candidates.update(self._stem_postings.get(stem, ()))
+            best_id, best_score = self._best_match(query_trigrams, candidates, model_numbers)
+
+            # Model number didn't pin it down, widen the search through the trigram index
+            if best_score < DEFAULT_MIN_SCORE:
+                fallback_id, fallback_score = self._best_match(
+                    query_trigrams, self._trigram_candidates(query_trigrams), model_numbers
+                )
+                if fallback_score > best_score:
+                    best_id, best_score = fallback_id, fallback_score
+
+            if best_id is None:
+                result = (None, 0.0)
+            else:
+                result = (self.names[best_id], round(best_score, 4))
+
+        if len(self._cache) >= MAX_CACHED_RESOLUTIONS:
+            self._cache.clear()
+        self._cache[raw_name] = result
+        return result
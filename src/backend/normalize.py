@@ -0,0 +1,401 @@
+"""Typed, columnar normalization of processor CSV files.
+
+Shared by the API (ingest.py) and the import scripts, so it only depends on the
+standard library and NumPy and must not import the rest of the backend.
+"""
+import csv
+import hashlib
+import itertools
+import re
+import numpy as np
+
+PROCESSOR_COLUMNS = (
+    "product", "status", "release_date", "code_name", "cores", "threads",
+    "lithography", "max_turbo_freq", "base_freq", "tdp", "cache",
+    "cache_info", "max_memory_size", "memory_types", "max_memory_speed",
+    "integrated_graphics", "release_quarter",
+)
+
+INTEGER_COLUMNS = (
+    "cores", "threads", "tdp", "max_memory_size", "max_memory_speed", "release_quarter"
+)
+FLOAT_COLUMNS = ("lithography", "max_turbo_freq", "base_freq", "cache")
+
+# Columns compared by dataset diffs; release_quarter is derived from release_date
+DIFF_COLUMNS = tuple(c for c in PROCESSOR_COLUMNS if c not in ("product", "release_quarter"))
+
+# CSV header -> (column, units accepted after the number); None marks text columns
+CSV_COLUMNS = {
+    "Product": ("product", None),
+    "Status": ("status", None),
+    "Release Date": ("release_date", None),
+    "Code Name": ("code_name", None),
+    "Cores": ("cores", ()),
+    "Threads": ("threads", ()),
+    "Lithography(nm)": ("lithography", ("NM",)),
+    "Max. Turbo Freq.(GHz)": ("max_turbo_freq", ("GHZ",)),
+    "Base Freq.(GHz)": ("base_freq", ("GHZ",)),
+    "TDP(W)": ("tdp", ("W",)),
+    "Cache(MB)": ("cache", ("MB",)),
+    "Cache Info": ("cache_info", None),
+    "Max Memory Size(GB)": ("max_memory_size", ("GB",)),
+    "Memory Types": ("memory_types", None),
+    "Max Memory Speed(MHz)": ("max_memory_speed", ("MHZ", "MT/S")),
+    "Integrated Graphics": ("integrated_graphics", None),
+}
+
+# Headers of older exports (e.g. v1_6 Quark) that give a column in another unit:
+# header -> (column, units accepted after the number, divisor to CSV_COLUMNS' unit)
+CSV_COLUMN_ALIASES = {
+    "Max. Turbo Freq.(MHz)": ("max_turbo_freq", ("MHZ",), 1000),
+    "Base Freq.(MHz)": ("base_freq", ("MHZ",), 1000),
+    "Cache(KB)": ("cache", ("KB",), 1024),
+}
+
+_ALIASES_BY_COLUMN = {
+    column: (header, units, divisor) for header, (column, units, divisor) in CSV_COLUMN_ALIASES.items()
+}
+
+# Values treated as missing in numeric columns (compared upper-cased and stripped)
+NULL_TOKENS = frozenset(("", "N/A", "NA", "NULL", "NONE", "-"))
+
+# A number with an optional unit, e.g. "2.20", "2.20 GHz", "125W"
+_NUMBER_RE = re.compile(r"^([-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:E[-+]?\d+)?)\s*([A-Z/]*)$")
+
+# Integer columns are stored as 32-bit INTEGER
+MAX_INTEGER = 2 ** 31 - 1
+
+# Rows normalized per vectorized pass
+NORMALIZE_CHUNK_SIZE = 5000
+
+# Rejected values kept verbatim in a report; the counts cover all of them
+MAX_REJECT_SAMPLES = 100
+
+# Intel lists release dates as "Q1'24"; two-digit years from 70 on are 19xx
+_RELEASE_DATE_RE = re.compile(r"^Q([1-4])\s*'?(\d{2}|\d{4})$")
+CENTURY_PIVOT = 70
+
+# Memory kinds (DDR4, LPDDR5, DDR3L, ...) and the numbers that follow them in
+# free-text fields like "Up to DDR5 5600 MT/s, Up to DDR4 3200 MT/s"
+_MEMORY_TOKEN_RE = re.compile(r"((?:LP)?DDR\d[A-Z]?)|(\d+)\s*(GB|MB)?")
+MIN_MEMORY_SPEED = 400
+MAX_MEMORY_SPEED = 20000
+
+
+def parse_release_quarter(value):
+    """Turn a release date like "Q1'24" into a sortable year*4+quarter integer."""
+    match = _RELEASE_DATE_RE.match((value or "").strip())
+    if match is None:
+        return None
+    quarter, year = int(match.group(1)), int(match.group(2))
+    if year < 100:
+        year += 1900 if year >= CENTURY_PIVOT else 2000
+    return year * 4 + quarter
+
+
+def parse_release_bound(value, upper):
+    """A quarter ("Q3'21") or a whole year ("2021") as an inclusive release_quarter bound.
+
+    A year covers Q1 as a lower bound and Q4 as an upper one. Raises ValueError
+    for anything else.
+    """
+    if value.strip().isdigit():
+        return int(value) * 4 + (4 if upper else 1)
+    quarter = parse_release_quarter(value)
+    if quarter is None:
+        raise ValueError(f"Invalid release date: {value}")
+    return quarter
+
+
+def format_release_quarter(value):
+    """Inverse of parse_release_quarter, e.g. 8097 -> "Q1'24"."""
+    year, quarter = divmod(value - 1, 4)
+    return f"Q{quarter + 1}'{year % 100:02d}"
+
+
+def parse_memory_types(value):
+    """Map each memory kind in a memory_types string to its highest listed speed (MT/s).
+
+    Speeds apply to every kind named since the previous speed, so "DDR4/LPDDR4 up
+    to 2400 MT/s" gives both kinds 2400. Kinds without a speed map to None.
+    """
+    speeds = {}
+    pending = []
+    after_speed = False
+    for kind, number, unit in _MEMORY_TOKEN_RE.findall((value or "").upper()):
+        if kind:
+            if after_speed:
+                pending = []
+            pending.append(kind)
+            speeds.setdefault(kind, None)
+            after_speed = False
+        elif not unit and MIN_MEMORY_SPEED <= int(number) <= MAX_MEMORY_SPEED:
+            for pending_kind in pending:
+                if speeds[pending_kind] is None or int(number) > speeds[pending_kind]:
+                    speeds[pending_kind] = int(number)
+            after_speed = True
+    return speeds
+
+
+def parse_number(value, units=(), integer=False):
+    """Parse one numeric field, e.g. "2.20", "2.20 GHz" or "N/A".
+
+    Returns None for missing values and raises ValueError with the reason for
+    anything else that isn't a number in one of the given units. Integer columns
+    accept decimals and truncate them, so "4.5" W is stored as 4.
+    """
+    text = value.strip().upper()
+    if text in NULL_TOKENS:
+        return None
+    match = _NUMBER_RE.match(text)
+    if match is None:
+        raise ValueError("not a number")
+    if match.group(2) and match.group(2) not in units:
+        raise ValueError(f"unexpected unit {match.group(2)}")
+    number = float(match.group(1))
+    if integer:
+        if abs(number) > MAX_INTEGER:
+            raise ValueError("out of range")
+        return int(number)
+    return number
+
+
+class RejectReport:
+    """Rows and values the normalizer could not use, by 1-based data row number.
+
+    Rejected values are stored as NULL and their row is kept; rows without a
+    product name are dropped. Rows with too few or too many fields are counted
+    separately, since they are padded or cut to the header and kept.
+    """
+
+    def __init__(self, max_samples=MAX_REJECT_SAMPLES):
+        self.max_samples = max_samples
+        self.rows_read = 0
+        self.rows_rejected = 0
+        self.values_rejected = {}
+        self.ragged_rows = 0
+        self.samples = []
+        self.unknown_headers = []
+        self.missing_headers = []
+
+    def add_header(self, header):
+        """Record headers that are not loaded and expected headers the file lacks."""
+        known = CSV_COLUMNS.keys() | CSV_COLUMN_ALIASES.keys()
+        self.unknown_headers = [name for name in header if name not in known]
+        present = {_header_column(name) for name in header}
+        self.missing_headers = [name for name, (column, _) in CSV_COLUMNS.items() if column not in present]
+
+    def add(self, row, column, value, reason, row_rejected=False):
+        if row_rejected:
+            self.rows_rejected += 1
+        else:
+            self.values_rejected[column] = self.values_rejected.get(column, 0) + 1
+        self._sample(row, column, value, reason)
+
+    def add_ragged(self, row, fields, width):
+        self.ragged_rows += 1
+        self._sample(row, None, f"{fields} fields", f"expected {width} fields")
+
+    def _sample(self, row, column, value, reason):
+        if len(self.samples) < self.max_samples:
+            self.samples.append({"row": row, "column": column, "value": value, "reason": reason})
+
+    def __bool__(self):
+        return bool(
+            self.rows_rejected or self.values_rejected or self.ragged_rows
+            or self.unknown_headers or self.missing_headers
+        )
+
+    def as_dict(self):
+        return {
+            "rows_read": self.rows_read,
+            "rows_rejected": self.rows_rejected,
+            "values_rejected": dict(self.values_rejected),
+            "ragged_rows": self.ragged_rows,
+            "samples": sorted(self.samples, key=lambda sample: sample["row"]),
+            "unknown_headers": list(self.unknown_headers),
+            "missing_headers": list(self.missing_headers),
+        }
+
+    def summary(self):
+        """One line for logs, e.g. "2 rows rejected, 3 values set to NULL (tdp: 3)"."""
+        values = sum(self.values_rejected.values())
+        columns = ", ".join(f"{column}: {count}" for column, count in sorted(self.values_rejected.items()))
+        line = (f"{self.rows_rejected} rows rejected, {values} values set to NULL"
+                + (f" ({columns})" if columns else ""))
+        if self.ragged_rows:
+            line += f"; {self.ragged_rows} rows padded or cut to the header"
+        if self.unknown_headers:
+            line += f"; ignored headers: {', '.join(self.unknown_headers)}"
+        if self.missing_headers:
+            line += f"; missing headers: {', '.join(self.missing_headers)}"
+        return line
+
+
+class NormalizedChunk:
+    """Typed columns for a run of CSV rows, named like PROCESSOR_COLUMNS.
+
+    Integer columns are int64 arrays and float columns float64 arrays, each
+    paired with a boolean validity mask; text columns are object arrays of str.
+    """
+
+    def __init__(self, values, valid):
+        self.values = values
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.values["product"])
+
+    def rows(self):
+        """Row tuples ordered like PROCESSOR_COLUMNS, with None for missing values."""
+        columns = []
+        for name in PROCESSOR_COLUMNS:
+            column = self.values[name]
+            if name in self.valid:
+                column = column.astype(object)
+                column[~self.valid[name]] = None
+            columns.append(column.tolist())
+        return list(zip(*columns))
+
+
+def _encode(column):
+    """Dictionary-encode a column: (distinct values, code per row)."""
+    lookup = {value: code for code, value in enumerate(dict.fromkeys(column))}
+    codes = np.fromiter(map(lookup.__getitem__, column), dtype=np.intp, count=len(column))
+    return list(lookup), codes
+
+
+def _parse_numeric(column, units, integer):
+    """Parse a column of strings, once per distinct value.
+
+    Returns (values, valid, rejects) where rejects maps the row positions of
+    unparseable values to the reason.
+    """
+    distinct, codes = _encode(column)
+    parsed = np.zeros(len(distinct), dtype=np.int64 if integer else np.float64)
+    ok = np.zeros(len(distinct), dtype=bool)
+    reasons = {}
+    for code, value in enumerate(distinct):
+        try:
+            number = parse_number(value, units, integer)
+        except ValueError as e:
+            reasons[code] = str(e)
+            continue
+        if number is not None:
+            parsed[code] = number
+            ok[code] = True
+    rejects = {}
+    if reasons:
+        rows = np.flatnonzero(np.isin(codes, list(reasons)))
+        rejects = {row: reasons[codes[row]] for row in rows.tolist()}
+    return parsed[codes], ok[codes], rejects
+
+
+def _parse_release_quarters(column):
+    distinct, codes = _encode(column)
+    quarters = [parse_release_quarter(value) for value in distinct]
+    parsed = np.array([quarter or 0 for quarter in quarters], dtype=np.int64)
+    ok = np.array([quarter is not None for quarter in quarters], dtype=bool)
+    return parsed[codes], ok[codes]
+
+
+def _header_column(header):
+    """The column a CSV header is loaded into, or None."""
+    if header in CSV_COLUMNS:
+        return CSV_COLUMNS[header][0]
+    if header in CSV_COLUMN_ALIASES:
+        return CSV_COLUMN_ALIASES[header][0]
+    return None
+
+
+def normalize_rows(header, rows, first_row=1, report=None):
+    """Normalize csv.reader rows (lists of str under header) into a NormalizedChunk.
+
+    first_row is the data row number of rows[0], used in the reject report.
+    """
+    if report is None:
+        report = RejectReport()
+    width = len(header)
+    numbers = range(first_row, first_row + len(rows))
+    if set(map(len, rows)) - {width}:
+        # Blank lines are skipped; short or long rows are padded or cut to the header
+        numbers = [number for number, row in zip(numbers, rows) if row]
+        rows = [row for row in rows if row]
+        for i, row in enumerate(rows):
+            if len(row) != width:
+                report.add_ragged(numbers[i], len(row), width)
+                rows[i] = (row + [""] * width)[:width]
+    report.rows_read += len(rows)
+
+    columns = dict(zip(header, zip(*rows))) if rows else {}
+    values, valid = {}, {}
+    for csv_name, (name, units) in CSV_COLUMNS.items():
+        column = columns.get(csv_name)
+        divisor = 1
+        if column is None and name in _ALIASES_BY_COLUMN:
+            alias, units, divisor = _ALIASES_BY_COLUMN[name]
+            column = columns.get(alias)
+        if units is None:
+            # Text is stored verbatim; a column missing from the file is empty
+            values[name] = np.array(column if column is not None else [""] * len(rows), dtype=object)
+            continue
+        integer = name in INTEGER_COLUMNS
+        if column is None:
+            values[name] = np.zeros(len(rows), dtype=np.int64 if integer else np.float64)
+            valid[name] = np.zeros(len(rows), dtype=bool)
+            continue
+        values[name], valid[name], rejects = _parse_numeric(column, units, integer)
+        if divisor != 1:
+            values[name] = values[name] / divisor
+        for i, reason in rejects.items():
+            report.add(numbers[i], name, column[i], reason)
+    values["release_quarter"], valid["release_quarter"] = _parse_release_quarters(
+        values["release_date"].tolist()
+    )
+
+    # The product name is the natural key; rows without one can't be stored
+    products = values["product"].tolist()
+    if not all(product and not product.isspace() for product in products):
+        keep = np.array([bool(product and not product.isspace()) for product in products], dtype=bool)
+        for i in np.flatnonzero(~keep).tolist():
+            report.add(numbers[i], "product", products[i], "missing product", row_rejected=True)
+        values = {name: column[keep] for name, column in values.items()}
+        valid = {name: column[keep] for name, column in valid.items()}
+    return NormalizedChunk(values, valid)
+
+
+def iter_normalized(text_file, chunk_size=NORMALIZE_CHUNK_SIZE, report=None):
+    """Read a processor CSV from a text stream, yielding a NormalizedChunk per chunk_size rows."""
+    reader = csv.reader(text_file)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.lstrip("\ufeff").strip() for name in header]
+    if report is not None:
+        report.add_header(header)
+    first_row = 1
+    while True:
+        rows = list(itertools.islice(reader, chunk_size))
+        if not rows:
+            return
+        chunk = normalize_rows(header, rows, first_row, report)
+        first_row += len(rows)
+        if len(chunk):
+            yield chunk
+
+
+def read_processor_rows(path, report=None):
+    """Row tuples (PROCESSOR_COLUMNS order) for every usable row of a CSV file."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [row for chunk in iter_normalized(f, report=report) for row in chunk.rows()]
+
+
+def row_digest(values):
+    """Hash a row's DIFF_COLUMNS values for dataset diffs and version content hashes."""
+    encoded = "\x1f".join("" if value is None else str(value) for value in values)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def version_sort_key(version):
+    """Order versions naturally, so v1_10 sorts after v1_8."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version)]
@@ -0,0 +1,30 @@
+import base64
+import json
+
+# Hard cap on page size for keyset pagination
+MAX_PAGE_SIZE = 1000
+
+# Rows fetched per round trip from the server-side cursor when streaming
+STREAM_BATCH_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(last_id):
+    """Encode the last id of a page as an opaque, URL-safe cursor."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the id encoded in a cursor, raising InvalidCursor if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(last_id, int):
+        raise InvalidCursor("Invalid cursor")
+    return last_id
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Optional, Union
+from .energy import DEFAULT_IDLE_FRACTION
 
 class ProcessorBase(BaseModel):
     product: str
@@ -18,9 +20,91 @@ class ProcessorBase(BaseModel):
     memory_types: str
     max_memory_speed: Optional[int]
     integrated_graphics: str
+    release_quarter: Optional[int] = None
+    dataset_version: Optional[str] = None
 
 class Processor(ProcessorBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class DatasetVersion(BaseModel):
+    version: str
+    row_count: int
+    content_hash: str
+    imported_at: Optional[datetime]
+    active: bool
+
+class DatasetChange(BaseModel):
+    product: str
+    fields: List[str]
+
+class DatasetDiff(BaseModel):
+    base: str
+    target: str
+    identical: bool
+    added: List[str]
+    removed: List[str]
+    changed: List[DatasetChange]
+
+class ProcessorPage(BaseModel):
+    items: List[Processor]
+    next_cursor: Optional[str]
+
+class TDPBatchRequest(BaseModel):
+    names: List[str]
+
+class TDPBatchResponse(BaseModel):
+    found: Dict[str, Optional[int]]
+    missing: List[str]
+
+class TextSearchHit(BaseModel):
+    id: int
+    product: str
+    code_name: Optional[str]
+    integrated_graphics: Optional[str]
+    tdp: Optional[int]
+    score: float
+
+class SimilarProcessor(BaseModel):
+    id: int
+    product: str
+    code_name: Optional[str]
+    cores: Optional[int]
+    threads: Optional[int]
+    lithography: Optional[float]
+    base_freq: Optional[float]
+    max_turbo_freq: Optional[float]
+    cache: Optional[float]
+    tdp: Optional[int]
+    distance: float
+
+class ProcessorResolution(BaseModel):
+    query: str
+    processor: str
+    tdp: Optional[int]
+    score: float
+
+# Utilization and power levels, as a share of full load
+Fraction = Annotated[float, Field(ge=0, le=1)]
+NonNegative = Annotated[float, Field(ge=0)]
+
+class EnergyEstimateRequest(BaseModel):
+    processors: List[str]
+    vcpu_share: Union[NonNegative, List[NonNegative]] = 1.0
+    utilization: Union[Fraction, List[Fraction]] = 1.0
+    duration_s: Union[NonNegative, List[NonNegative]]
+    idle_fraction: Fraction = DEFAULT_IDLE_FRACTION
+    resolve_names: bool = False
+    per_invocation: bool = False
+
+class EnergyEstimateResponse(BaseModel):
+    invocations: int
+    estimated: int
+    total_joules: float
+    total_watt_hours: float
+    by_processor: Dict[str, float]
+    missing: List[str]
+    joules: Optional[List[Optional[float]]] = None
+    watt_hours: Optional[List[Optional[float]]] = None
@@ -0,0 +1,142 @@
+import threading
+import numpy as np
+from . import models
+from .datasets import resolve_version, scope_to_version
+
+# Spec fields compared by the similarity search
+FEATURES = ("cores", "threads", "lithography", "base_freq", "max_turbo_freq", "cache", "tdp")
+
+# Counts and sizes compare by ratio: 4 -> 8 cores is a bigger step than 56 -> 60
+LOG_FEATURES = frozenset(("cores", "threads", "cache", "tdp"))
+
+# Processors must share this many known features with the query to be ranked
+MIN_SHARED_FEATURES = 2
+
+MAX_NEIGHBOURS = 100
+
+
+class SimilarityIndex:
+    """Normalized spec vectors of the active dataset version for k-NN queries.
+
+    Each feature is log-scaled where it makes sense and standardized to zero
+    mean and unit variance. Missing values are masked out of the distance, and
+    distances are rescaled by the number of features compared so processors
+    with gaps in their specs stay comparable. Queries are a single vectorized
+    pass over the matrix, which stays well under a millisecond at tens of
+    thousands of rows, so no tree is needed for seven dimensions.
+    """
+
+    def __init__(self):
+        self._state = None
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def rebuild(self, db):
+        """Rebuild the vectors from the active dataset version and swap them in atomically."""
+        columns = [getattr(models.Processor, name) for name in FEATURES]
+        query = db.query(models.Processor.id, models.Processor.product, models.Processor.code_name, *columns)
+        rows = scope_to_version(query, resolve_version()).order_by(models.Processor.id).all()
+
+        raw = np.array(
+            [[np.nan if value is None else value for value in row[3:]] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(FEATURES))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for i, name in enumerate(FEATURES):
+                if name in LOG_FEATURES:
+                    raw[:, i] = np.log1p(np.clip(raw[:, i], 0, None))
+        known = ~np.isnan(raw)
+        counts = known.sum(axis=0)
+        mean = np.where(counts > 0, np.nansum(raw, axis=0) / np.maximum(counts, 1), 0.0)
+        std = np.sqrt(np.where(counts > 0, np.nansum((raw - mean) ** 2, axis=0) / np.maximum(counts, 1), 1.0))
+        std[std == 0] = 1.0
+
+        products = [row.product for row in rows]
+        product_codes = {product: code for code, product in enumerate(dict.fromkeys(products))}
+        state = {
+            "vectors": np.where(known, (raw - mean) / std, 0.0).astype(np.float32),
+            "known": known.astype(np.float32),
+            "mean": mean,
+            "std": std,
+            "ids": np.array([row.id for row in rows], dtype=np.int64),
+            "positions": {row.id: position for position, row in enumerate(rows)},
+            "product_codes": np.array([product_codes[product] for product in products], dtype=np.int32),
+            "product_code": product_codes,
+            "rows": [tuple(row) for row in rows],
+        }
+        self.restore(state)
+        return len(rows)
+
+    def snapshot(self):
+        return self._state
+
+    def restore(self, state):
+        with self._lock:
+            self._state = state
+            self.ready = True
+
+    def vector(self, spec, state=None):
+        """Normalize a {feature: value} dict into (vector, known mask); unknown features are 0."""
+        state = state or self._state
+        vector = np.zeros(len(FEATURES), dtype=np.float32)
+        known = np.zeros(len(FEATURES), dtype=np.float32)
+        for i, name in enumerate(FEATURES):
+            value = spec.get(name)
+            if value is None:
+                continue
+            if name in LOG_FEATURES:
+                value = np.log1p(max(value, 0))
+            vector[i] = (value - state["mean"][i]) / state["std"][i]
+            known[i] = 1.0
+        return vector, known
+
+    def nearest(self, spec, k=5, exclude_product=None):
+        """Return up to k (row, distance) pairs closest to spec, nearest first.
+
+        spec maps feature names to values; missing or None features are ignored.
+        Rows named exclude_product (the query processor itself) are skipped.
+        """
+        with self._lock:
+            state = self._state
+        if state is None or not state["rows"]:
+            return []
+        query, query_known = self.vector(spec, state)
+        query_features = query_known.sum()
+        if query_features == 0:
+            return []
+
+        vectors, known = state["vectors"], state["known"]
+        shared = known @ query_known
+        squared = ((vectors - query) ** 2 * known) @ query_known
+        eligible = shared >= min(MIN_SHARED_FEATURES, query_features)
+        if exclude_product is not None and exclude_product in state["product_code"]:
+            eligible &= state["product_codes"] != state["product_code"][exclude_product]
+
+        # Scale to the query's feature count so comparisons over fewer features aren't favoured
+        distances = np.full(len(state["rows"]), np.inf, dtype=np.float32)
+        distances[eligible] = squared[eligible] * (query_features / shared[eligible])
+        k = min(k, int(eligible.sum()))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.lexsort((state["ids"][nearest], distances[nearest]))]
+        return [(state["rows"][position], float(np.sqrt(distances[position]))) for position in nearest]
+
+    def spec_of(self, processor_id):
+        """The feature dict of an indexed processor, or None if it isn't in the active version."""
+        with self._lock:
+            state = self._state
+        position = state["positions"].get(processor_id) if state is not None else None
+        if position is None:
+            return None
+        row = state["rows"][position]
+        return dict(zip(FEATURES, row[3:]), product=row[1])
+
+    def __len__(self):
+        return len(self._state["rows"]) if self._state is not None else 0
+
+
+def neighbour_response(row, distance):
+    return dict(zip(("id", "product", "code_name") + FEATURES, row), distance=round(distance, 4))
+
+
+similarity_index = SimilarityIndex()
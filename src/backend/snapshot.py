@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from stat import S_IWGRP, S_IWOTH
+from sqlalchemy import func
+from . import models
+from .caching import catalog_revision
+from .database import DATABASE_URL
+
+logger = logging.getLogger("uvicorn.error")
+
+# Bump when the layout of any store's snapshot() changes
+SNAPSHOT_FORMAT = 2
+
+# Local file the in-memory catalog stores are saved to, so a restart can skip
+# rebuilding them from the database. The file is unpickled, so there is no
+# shared default location: snapshots are off unless a path is configured
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "")
+
+
+def snapshot_key(db):
+    """Identify the catalog state a snapshot was taken from.
+
+    The revision catches imports that bump it; the row count and highest id
+    also catch writes made by tools that don't.
+    """
+    count, max_id = db.query(func.count(models.Processor.id), func.max(models.Processor.id)).one()
+    return (
+        SNAPSHOT_FORMAT,
+        hashlib.sha256(DATABASE_URL.encode("utf-8")).hexdigest(),
+        catalog_revision.revision,
+        catalog_revision.etag,
+        catalog_revision.active_version,
+        count,
+        max_id,
+    )
+
+
+def _trusted(stat):
+    """Whether a snapshot file is ours alone to write, so unpickling it is safe."""
+    getuid = getattr(os, "getuid", None)
+    if getuid is not None and stat.st_uid != getuid():
+        return False
+    return not stat.st_mode & (S_IWGRP | S_IWOTH)
+
+
+def load_snapshot(stores, key, path=CATALOG_SNAPSHOT_PATH):
+    """Restore every store from the snapshot file if it matches key; return True on success.
+
+    The file is only unpickled if it belongs to the current user and nobody
+    else can write it.
+    """
+    if not path:
+        return False
+    try:
+        with open(path, "rb") as f:
+            if not _trusted(os.fstat(f.fileno())):
+                logger.warning("Ignoring catalog snapshot %s: not owned by this user or writable by others", path)
+                return False
+            saved_key, states = pickle.load(f)
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        logger.warning("Ignoring unreadable catalog snapshot %s: %s", path, e)
+        return False
+    if saved_key != key or set(states) != set(stores):
+        return False
+    for name, store in stores.items():
+        store.restore(states[name])
+    return True
+
+
+def save_snapshot(stores, key, path=CATALOG_SNAPSHOT_PATH):
+    """Write every store's state to the snapshot file atomically, readable by the owner only."""
+    if not path:
+        return False
+    states = {name: store.snapshot() for name, store in stores.items()}
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as f:
+            pickle.dump((key, states), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, path)
+    except OSError as e:
+        logger.warning("Could not write catalog snapshot %s: %s", path, e)
+        return False
+    return True
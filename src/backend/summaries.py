@@ -0,0 +1,162 @@
+import threading
+from sqlalchemy import delete, tuple_
+from . import models
+from .normalize import PROCESSOR_COLUMNS
+from .datasets import resolve_version, scope_to_version
+
+# Grouping dimensions kept in processor_summaries. "all" holds catalog-wide totals.
+# The import scripts compute the same keys in SQL, see SUMMARY_KEY_SQL there.
+SUMMARY_DIMENSIONS = ("all", "family", "code_name", "lithography", "release_quarter")
+
+_PRODUCT = PROCESSOR_COLUMNS.index("product")
+_CODE_NAME = PROCESSOR_COLUMNS.index("code_name")
+_LITHOGRAPHY = PROCESSOR_COLUMNS.index("lithography")
+_RELEASE_DATE = PROCESSOR_COLUMNS.index("release_date")
+_CORES = PROCESSOR_COLUMNS.index("cores")
+_TDP = PROCESSOR_COLUMNS.index("tdp")
+_TURBO = PROCESSOR_COLUMNS.index("max_turbo_freq")
+
+
+def format_lithography(value):
+    """Format a lithography node without trailing zeros, e.g. 14.0 -> "14"."""
+    return ("%f" % value).rstrip("0").rstrip(".")
+
+
+def summary_keys(values):
+    """Return the (dimension, key) groups a row tuple (PROCESSOR_COLUMNS order) belongs to."""
+    keys = [("all", "all")]
+    family = (values[_PRODUCT] or "").split(" ", 1)[0]
+    if family:
+        keys.append(("family", family))
+    if values[_CODE_NAME]:
+        keys.append(("code_name", values[_CODE_NAME]))
+    if values[_LITHOGRAPHY] is not None:
+        keys.append(("lithography", format_lithography(values[_LITHOGRAPHY])))
+    if values[_RELEASE_DATE]:
+        keys.append(("release_quarter", values[_RELEASE_DATE]))
+    return keys
+
+
+class SummaryAccumulator:
+    """Mergeable per-group partial aggregates (counts, sums, max)."""
+
+    def __init__(self):
+        self.groups = {}
+
+    def add_rows(self, rows):
+        for values in rows:
+            cores, tdp, turbo = values[_CORES], values[_TDP], values[_TURBO]
+            for group in summary_keys(values):
+                partial = self.groups.get(group)
+                if partial is None:
+                    partial = self.groups[group] = [0, 0, 0, 0, 0, None]
+                partial[0] += 1
+                if cores is not None:
+                    partial[1] += cores
+                    partial[2] += 1
+                if tdp is not None:
+                    partial[3] += tdp
+                    partial[4] += 1
+                if turbo is not None and (partial[5] is None or turbo > partial[5]):
+                    partial[5] = turbo
+
+
+def merge_summaries(db, accumulator):
+    """Add freshly inserted rows' aggregates to the stored summaries (no table scan)."""
+    if not accumulator.groups:
+        return
+    existing = {
+        (row.dimension, row.key): row
+        for row in db.query(models.ProcessorSummary).filter(
+            tuple_(models.ProcessorSummary.dimension, models.ProcessorSummary.key).in_(
+                list(accumulator.groups)
+            )
+        )
+    }
+    for (dimension, key), (count, cores_sum, cores_count, tdp_sum, tdp_count, turbo) in accumulator.groups.items():
+        row = existing.get((dimension, key))
+        if row is None:
+            row = models.ProcessorSummary(
+                dimension=dimension, key=key, processors=0, cores_sum=0,
+                cores_count=0, tdp_sum=0, tdp_count=0, max_turbo_freq=None
+            )
+            db.add(row)
+        row.processors += count
+        row.cores_sum += cores_sum
+        row.cores_count += cores_count
+        row.tdp_sum += tdp_sum
+        row.tdp_count += tdp_count
+        if turbo is not None and (row.max_turbo_freq is None or turbo > row.max_turbo_freq):
+            row.max_turbo_freq = turbo
+
+
+def accumulate_version(db, version=None):
+    """Aggregate one dataset version (None: all rows) in one streaming pass."""
+    accumulator = SummaryAccumulator()
+    columns = [getattr(models.Processor, name) for name in PROCESSOR_COLUMNS]
+    accumulator.add_rows(scope_to_version(db.query(*columns), version).yield_per(1000))
+    return accumulator
+
+
+def rebuild_summaries(db, version=None):
+    """Replace the stored summaries with those of one dataset version; the caller commits.
+
+    Runs on the write paths (upload, dataset activation, migrations), inside
+    the caller's transaction.
+    """
+    accumulator = accumulate_version(db, version)
+    db.execute(delete(models.ProcessorSummary))
+    merge_summaries(db, accumulator)
+
+
+def _summary(key, processors, cores_sum, cores_count, tdp_sum, tdp_count, max_turbo_freq):
+    return {
+        "key": key,
+        "processors": processors,
+        "avg_cores": cores_sum / cores_count if cores_count else None,
+        "avg_tdp": tdp_sum / tdp_count if tdp_count else None,
+        "max_turbo_freq": max_turbo_freq,
+    }
+
+
+class SummaryCache:
+    """In-memory copy of processor_summaries, reloaded when the catalog revision changes."""
+
+    def __init__(self):
+        self.by_dimension = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.by_dimension is not None
+
+    def rebuild(self, db):
+        """Reload from processor_summaries; read-only, so it is safe on the request path."""
+        by_dimension = {dimension: [] for dimension in SUMMARY_DIMENSIONS}
+        rows = db.query(models.ProcessorSummary).order_by(
+            models.ProcessorSummary.dimension, models.ProcessorSummary.key
+        ).all()
+        for row in rows:
+            by_dimension.setdefault(row.dimension, []).append(_summary(
+                row.key, row.processors, row.cores_sum, row.cores_count, row.tdp_sum, row.tdp_count,
+                row.max_turbo_freq
+            ))
+        if not rows and db.query(models.Processor.id).first() is not None:
+            # Catalog loaded without summaries (older importer, not yet migrated):
+            # aggregate in memory rather than writing from a read
+            groups = accumulate_version(db, resolve_version()).groups
+            for (dimension, key) in sorted(groups):
+                by_dimension.setdefault(dimension, []).append(_summary(key, *groups[(dimension, key)]))
+        with self._lock:
+            self.by_dimension = by_dimension
+        return len(by_dimension)
+
+    def snapshot(self):
+        return self.by_dimension
+
+    def restore(self, state):
+        with self._lock:
+            self.by_dimension = state
+
+
+summary_cache = SummaryCache()
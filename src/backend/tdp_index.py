@@ -0,0 +1,95 @@
+import threading
+from . import models
+from .name_resolver import NameResolver
+from .datasets import resolve_version, scope_to_version
+
+# Upper bound on remembered unknown names so a flood of bad lookups can't grow memory
+MAX_MISSING_NAMES = 10000
+
+
+class TDPIndex:
+    """In-memory product name -> TDP lookup used by the /processor/tdp endpoints."""
+
+    def __init__(self):
+        self._entries = {}
+        self._missing = set()
+        self._resolver = NameResolver([])
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def rebuild(self, db):
+        """Reload the index from the active dataset version and swap it in atomically."""
+        query = db.query(models.Processor.product, models.Processor.tdp)
+        rows = scope_to_version(query, resolve_version()).order_by(models.Processor.id).all()
+
+        entries = {}
+        for product, tdp in rows:
+            # Keep the first row per product, like the old .first() lookups did
+            if product not in entries:
+                entries[product] = tdp
+        resolver = NameResolver(entries.keys())
+
+        with self._lock:
+            self._entries = entries
+            self._resolver = resolver
+            self._missing = set()
+            self.ready = True
+        return len(entries)
+
+    def snapshot(self):
+        return self._entries, self._resolver
+
+    def restore(self, state):
+        entries, resolver = state
+        with self._lock:
+            self._entries = entries
+            self._resolver = resolver
+            self._missing = set()
+            self.ready = True
+
+    def lookup(self, name):
+        """Return (found, tdp) for a product name without touching the database."""
+        missing = self._missing
+        if name in missing:
+            return False, None
+
+        entries = self._entries
+        if name in entries:
+            return True, entries[name]
+
+        with self._lock:
+            # Only record the miss if the index wasn't swapped under us
+            if missing is self._missing and len(missing) < MAX_MISSING_NAMES:
+                missing.add(name)
+        return False, None
+
+    def lookup_many(self, names):
+        """Resolve a list of names in one pass, returning (found, missing)."""
+        entries = self._entries
+        found = {}
+        missing = []
+        seen = set()
+        for name in names:
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in entries:
+                found[name] = entries[name]
+            else:
+                missing.append(name)
+        return found, missing
+
+    def resolve(self, raw_name):
+        """Resolve a raw CPU model string to (product, tdp, score), or (None, None, 0.0)."""
+        with self._lock:
+            entries, resolver = self._entries, self._resolver
+        product, score = resolver.resolve(raw_name)
+        if product is None:
+            return None, None, 0.0
+        return product, entries.get(product), score
+
+    def __len__(self):
+        return len(self._entries)
+
+
+tdp_index = TDPIndex()
@@ -0,0 +1,136 @@
+"""Memory-mapped binary product name -> TDP/spec table for cold workers.
+
+Opening the table maps the file and reads a 32-byte header; a lookup is a
+binary search over fixed-width records, so nothing is parsed up front. Only
+the standard library is imported, keeping the import itself cheap.
+
+Layout (little-endian):
+    header   magic b"TDPT", format version (u16), record size (u16),
+             record count (u32), string table offset (u32), dataset version
+             (16 bytes, NUL padded)
+    records  one per product, sorted by UTF-8 name: name offset (u32) and
+             length (u16) in the string table, cores and threads (i16), tdp in
+             W and base/turbo frequency in MHz (i32); -1 marks a missing value
+    strings  the UTF-8 product names, back to back
+"""
+import mmap
+import os
+import struct
+
+MAGIC = b"TDPT"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHII16s")
+_RECORD = struct.Struct("<IHhhxxiii")
+_MISSING = -1
+
+
+def write_tdp_table(path, entries, dataset_version=None):
+    """Write entries to a new table at path and return the number of products.
+
+    entries yields (product, tdp, cores, threads, base_freq, max_turbo_freq)
+    with frequencies in GHz and None for missing values; the first entry per
+    product wins, like the API's TDP index. The file is moved into place
+    complete, so readers never map a partial table.
+    """
+    products = {}
+    for product, *specs in entries:
+        products.setdefault(product.encode("utf-8"), specs)
+
+    names = sorted(products)
+    strings_offset = _HEADER.size + _RECORD.size * len(names)
+    records, offset = [], 0
+    for name in names:
+        tdp, cores, threads, base_freq, max_turbo_freq = products[name]
+        records.append(_RECORD.pack(
+            offset, len(name), _int(cores), _int(threads), _int(tdp), _mhz(base_freq), _mhz(max_turbo_freq)
+        ))
+        offset += len(name)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, _RECORD.size, len(names), strings_offset, (dataset_version or "").encode("ascii")
+    )
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(b"".join(records))
+        f.write(b"".join(names))
+    os.replace(temp_path, path)
+    return len(names)
+
+
+def _int(value):
+    return _MISSING if value is None else int(value)
+
+
+def _mhz(ghz):
+    return _MISSING if ghz is None else round(ghz * 1000)
+
+
+class TDPTable:
+    """Read-only view of a file written by write_tdp_table()."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"Not a TDP table: {path}")
+        magic, version, record_size, count, strings_offset, dataset_version = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != _RECORD.size:
+            self._map.close()
+            raise ValueError(f"Not a TDP table or unsupported format version: {path}")
+        self._count = count
+        self._strings_offset = strings_offset
+        self.dataset_version = dataset_version.rstrip(b"\0").decode("ascii") or None
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _find(self, name):
+        """Unpacked record for an exact product name, or None."""
+        key = name.encode("utf-8")
+        data, strings_offset = self._map, self._strings_offset
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            record = _RECORD.unpack_from(data, _HEADER.size + middle * _RECORD.size)
+            start = strings_offset + record[0]
+            candidate = data[start:start + record[1]]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return record
+        return None
+
+    def lookup(self, name):
+        """Return (found, tdp) for an exact product name, like /api/processor/tdp/{name}."""
+        record = self._find(name)
+        if record is None:
+            return False, None
+        return True, None if record[4] == _MISSING else record[4]
+
+    def specs(self, name):
+        """tdp, cores, threads, base_freq and max_turbo_freq (GHz) of a product, or None."""
+        record = self._find(name)
+        if record is None:
+            return None
+        _, _, cores, threads, tdp, base_mhz, turbo_mhz = record
+        return {
+            "tdp": None if tdp == _MISSING else tdp,
+            "cores": None if cores == _MISSING else cores,
+            "threads": None if threads == _MISSING else threads,
+            "base_freq": None if base_mhz == _MISSING else base_mhz / 1000,
+            "max_turbo_freq": None if turbo_mhz == _MISSING else turbo_mhz / 1000,
+        }
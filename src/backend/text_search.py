@@ -0,0 +1,126 @@
+import threading
+import numpy as np
+from sqlalchemy import func, literal, literal_column, select
+from . import models
+from .datasets import resolve_version, scope_to_version
+from .text_search_common import FIELD_WEIGHTS, MIN_SCORE, search_trigrams
+
+MAX_RESULTS = 100
+
+# One expression for the GIN index and the query, so PostgreSQL can match them;
+# import_csv_to_vercel_postgres.py keeps a copy
+SEARCH_DOCUMENT_SQL = (
+    "(product || ' ' || coalesce(code_name, '') || ' ' || coalesce(integrated_graphics, ''))"
+)
+
+
+class TextSearchIndex:
+    """In-memory trigram inverted index over product, code name and graphics.
+
+    Used when the database is not PostgreSQL. A field's score is the share of the
+    query's trigrams it contains, close to pg_trgm's word_similarity().
+    """
+
+    def __init__(self):
+        self._rows = []
+        self._product_rank = np.zeros(0, dtype=np.int32)
+        self._postings = {}
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def rebuild(self, db):
+        """Index the active dataset version and swap it in atomically."""
+        query = db.query(
+            models.Processor.id, models.Processor.product, models.Processor.code_name,
+            models.Processor.integrated_graphics, models.Processor.tdp
+        )
+        rows = scope_to_version(query, resolve_version()).order_by(models.Processor.id).all()
+
+        postings = {field: {} for field in FIELD_WEIGHTS}
+        for position, row in enumerate(rows):
+            for field in FIELD_WEIGHTS:
+                for trigram in search_trigrams(getattr(row, field)):
+                    postings[field].setdefault(trigram, []).append(position)
+        postings = {
+            field: {trigram: np.array(positions, dtype=np.int32) for trigram, positions in index.items()}
+            for field, index in postings.items()
+        }
+        # Position of each row in product name order, for tie-breaking
+        product_rank = np.empty(len(rows), dtype=np.int32)
+        product_rank[sorted(range(len(rows)), key=lambda position: rows[position].product)] = np.arange(len(rows))
+        state = (
+            [(row.id, row.product, row.code_name, row.integrated_graphics, row.tdp) for row in rows],
+            product_rank,
+            postings,
+        )
+        self.restore(state)
+        return len(rows)
+
+    def snapshot(self):
+        return self._rows, self._product_rank, self._postings
+
+    def restore(self, state):
+        with self._lock:
+            self._rows, self._product_rank, self._postings = state
+            self.ready = True
+
+    def search(self, text, limit=20):
+        """Return up to limit hits as dicts, best match first."""
+        with self._lock:
+            rows, product_rank, postings = self._rows, self._product_rank, self._postings
+        query_trigrams = search_trigrams(text)
+        if not query_trigrams or not rows:
+            return []
+
+        scores = np.zeros(len(rows), dtype=np.float64)
+        for field, weight in FIELD_WEIGHTS.items():
+            counts = np.zeros(len(rows), dtype=np.float64)
+            for trigram in query_trigrams:
+                positions = postings[field].get(trigram)
+                if positions is not None:
+                    counts[positions] += 1.0
+            np.maximum(scores, counts * (weight / len(query_trigrams)), out=scores)
+
+        matches = np.flatnonzero(scores >= MIN_SCORE)
+        # Ties go to the product name, like ORDER BY score DESC, product
+        ranked = matches[np.lexsort((product_rank[matches], -scores[matches]))][:limit].tolist()
+        return [
+            {
+                "id": rows[position][0],
+                "product": rows[position][1],
+                "code_name": rows[position][2],
+                "integrated_graphics": rows[position][3],
+                "tdp": rows[position][4],
+                "score": round(float(scores[position]), 4),
+            }
+            for position in ranked
+        ]
+
+    def __len__(self):
+        return len(self._rows)
+
+
+def trigram_search_query(text, limit=20):
+    """Ranked pg_trgm search of the active dataset version, using the GIN index
+    created by add_text_search_index()."""
+    processor = models.Processor
+    scores = [
+        func.word_similarity(literal(text), func.coalesce(getattr(processor, field), "")) * weight
+        for field, weight in FIELD_WEIGHTS.items()
+    ]
+    score = func.greatest(*scores).label("score")
+    query = select(
+        processor.id, processor.product, processor.code_name, processor.integrated_graphics,
+        processor.tdp, score
+    ).where(literal_column(SEARCH_DOCUMENT_SQL).op("%>")(literal(text)))
+    query = scope_to_version(query, resolve_version())
+    inner = query.subquery()
+    return (
+        select(inner)
+        .where(inner.c.score >= MIN_SCORE)
+        .order_by(inner.c.score.desc(), inner.c.product)
+        .limit(limit)
+    )
+
+
+text_search_index = TextSearchIndex()
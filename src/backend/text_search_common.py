@@ -0,0 +1,23 @@
+"""Trigram scoring shared by text_search.py and the offline catalog file.
+
+Only depends on the standard library, so catalog_file.py can use it without
+importing the database layer.
+"""
+import re
+
+# Searched columns and the weight of a match in each; a product match ranks first
+FIELD_WEIGHTS = {"product": 1.0, "code_name": 0.9, "integrated_graphics": 0.8}
+
+# Same default as pg_trgm.word_similarity_threshold, so both backends return the same rows
+MIN_SCORE = 0.6
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def search_trigrams(text):
+    """Trigrams of each word, padded the way pg_trgm does ("  w", " wo", "wor", ...)."""
+    trigrams = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
@@ -1,8 +1,14 @@
 import os
+import sys
 import json
 import psycopg2
 from psycopg2 import sql
-import csv
+
+# Add the project root directory to the Python path for the shared CSV normalizer
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.backend.normalize import PROCESSOR_COLUMNS, RejectReport, read_processor_rows
  
 
 
@@ -18,25 +24,8 @@ DB_PORT = "5432"
 DATA_DIR = "/home/bigrobbin/Desktop/git/lithops_database/src/resources/v1_8"  # change this to your directory path
 
 
-def clean_value(value, field_type):
-    """Clean and convert values, handling N/A and various formats"""
-    if not value or str(value).strip().upper() in ['N/A', 'NA', 'NULL', '']:
-        return None
-    
-    try:
-        # Remove any units and whitespace
-        cleaned = str(value).strip()
-        for unit in ['GHz', 'nm', 'MB', 'W', 'GB', 'MHz', ' ']:
-            cleaned = cleaned.replace(unit, '')
-        
-        if field_type == 'int':
-            return int(float(cleaned)) if cleaned else None
-        elif field_type == 'float':
-            return float(cleaned) if cleaned else None
-        else:
-            return str(value).strip() if value else None
-    except (ValueError, AttributeError):
-        return None
+# Columns of the products table filled from the CSV, besides filename
+PRODUCT_COLUMNS = tuple(c for c in PROCESSOR_COLUMNS if c != 'release_quarter')
 
 def create_database():
     """Create the database if it doesn't exist"""
@@ -130,54 +119,40 @@ def insert_data():
         for csv_file in csv_files:
             file_path = os.path.join(DATA_DIR, csv_file)
             
-            with open(file_path, 'r') as f:
-                reader = csv.DictReader(f)
+            # Typed values from the shared normalizer (N/A, units, decimals in int columns)
+            report = RejectReport()
+            rows = read_processor_rows(file_path, report)
+            if report:
+                print(f"{csv_file}: {report.summary()}")
+            
+            for parsed in rows:
+                row = dict(zip(PROCESSOR_COLUMNS, parsed))
+                insert_data = {'filename': csv_file}
+                insert_data.update((column, row[column]) for column in PRODUCT_COLUMNS)
                 
-                for row in reader:
-                    # Map CSV columns to database columns with proper type conversion
-                    insert_data = {
-                        'filename': csv_file,
-                        'product': clean_value(row.get('Product'), 'str'),
-                        'status': clean_value(row.get('Status'), 'str'),
-                        'release_date': clean_value(row.get('Release Date'), 'str'),
-                        'code_name': clean_value(row.get('Code Name'), 'str'),
-                        'cores': clean_value(row.get('Cores'), 'int'),
-                        'threads': clean_value(row.get('Threads'), 'int'),
-                        'lithography': clean_value(row.get('Lithography(nm)'), 'float'),
-                        'max_turbo_freq': clean_value(row.get('Max. Turbo Freq.(GHz)'), 'float'),
-                        'base_freq': clean_value(row.get('Base Freq.(GHz)'), 'float'),
-                        'tdp': clean_value(row.get('TDP(W)'), 'int'),
-                        'cache': clean_value(row.get('Cache(MB)'), 'float'),
-                        'cache_info': clean_value(row.get('Cache Info'), 'str'),
-                        'max_memory_size': clean_value(row.get('Max Memory Size(GB)'), 'int'),
-                        'memory_types': clean_value(row.get('Memory Types'), 'str'),
-                        'max_memory_speed': clean_value(row.get('Max Memory Speed(MHz)'), 'int'),
-                        'integrated_graphics': clean_value(row.get('Integrated Graphics'), 'str')
-                    }
-                    
-                    # Build the INSERT query
-                    columns = insert_data.keys()
-                    values = [insert_data[column] for column in columns]
-                    
-                    insert_query = sql.SQL("""
-                        INSERT INTO products ({})
-                        VALUES ({})
-                    """).format(
-                        sql.SQL(', ').join(map(sql.Identifier, columns)),
-                        sql.SQL(', ').join(sql.Placeholder() * len(columns))
-                    )
-                    
-                    try:
-                        cursor.execute(insert_query, values)
-                    except Exception as e:
-                        print(f"Error inserting row: {e}")
-                        print(f"Problematic row data: {insert_data}")
-                        conn.rollback()
-                        continue
+                # Build the INSERT query
+                columns = insert_data.keys()
+                values = [insert_data[column] for column in columns]
                 
-                conn.commit()
-                print(f"Successfully inserted data from {csv_file}")
-        
+                insert_query = sql.SQL("""
+                    INSERT INTO products ({})
+                    VALUES ({})
+                """).format(
+                    sql.SQL(', ').join(map(sql.Identifier, columns)),
+                    sql.SQL(', ').join(sql.Placeholder() * len(columns))
+                )
+                
+                try:
+                    cursor.execute(insert_query, values)
+                except Exception as e:
+                    print(f"Error inserting row: {e}")
+                    print(f"Problematic row data: {insert_data}")
+                    conn.rollback()
+                    continue
+            
+            conn.commit()
+            print(f"Successfully inserted data from {csv_file}")
+    
         cursor.close()
         conn.close()
         print("Data insertion completed.")